@@ -2,6 +2,7 @@
 
 from maix import camera, display, nn, image
 from debug_config import DebugLogger
+from config import POSE_MODEL_PATH, DETECTOR_MODEL_PATH
 
 # Module-level debug logger instance
 logger = DebugLogger(tag="CAM_MGR", instance_enable=False)
@@ -24,19 +25,23 @@ def initialize_cameras():
     """
     global cam, disp, pose_extractor, detector
     
-    # Initialize pose extractor (YOLO11 pose model for keypoint detection)
-    pose_extractor = nn.YOLO11(model="/root/models/yolo11n_pose.mud", dual_buff=True)
+    # Initialize pose extractor (YOLO11 pose model for keypoint detection).
+    # Single-buffered: the main loop only runs it on some frames, and a
+    # dual-buffered model would return the result for the image it was given
+    # on its previous call, possibly several frames old.
+    pose_extractor = nn.YOLO11(model=POSE_MODEL_PATH, dual_buff=False)
     
-    # Initialize person detector (YOLOv8 for detecting person existence)
-    detector = nn.YOLO11(model="/root/models/yolo11n.mud", dual_buff=True)
+    # Initialize person detector (YOLOv8 for detecting person existence).
+    # Dual-buffered: it runs on every frame, so its results lag by one frame.
+    detector = nn.YOLO11(model=DETECTOR_MODEL_PATH, dual_buff=True)
 
     # Initialize camera (single camera, no RTMP)
     cam = camera.Camera(pose_extractor.input_width(), pose_extractor.input_height(), pose_extractor.input_format(), fps=60)
     disp = display.Display()
 
     logger.print("CAM_MGR", "Camera initialized: %sx%s @ %d fps", pose_extractor.input_width(), pose_extractor.input_height(), cam.fps())
-    logger.print("CAM_MGR", "Pose extractor: /root/models/yolo11n_pose.mud")
-    logger.print("CAM_MGR", "Person detector: /root/models/yolo11n.mud")
+    logger.print("CAM_MGR", "Pose extractor: %s", POSE_MODEL_PATH)
+    logger.print("CAM_MGR", "Person detector: %s", DETECTOR_MODEL_PATH)
     
     return cam, disp, pose_extractor, detector
 
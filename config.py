@@ -4,7 +4,9 @@ import os
 import json
 import time
 import socket
-import requests
+from tools.http_client import session as http_session
+from tools.file_writer import write_file_async
+from tools.json_codec import dumps_indent_bytes as json_dumps_indent_bytes, loads as json_loads
 
 # Import CameraStateManager from control_manager for proper state management
 from control_manager import camera_state_manager
@@ -85,18 +87,21 @@ def _parse_env_file(path):
 
 def reload_from_env():
     """Reload env-derived config values from os.environ."""
-    global STREAMING_SERVER_BASE_URL, STREAMING_HTTP_URL
+    global STREAMING_SERVER_BASE_URL, STREAMING_HTTP_URL, RAW_SOCKET_UPLOADS
     STREAMING_SERVER_BASE_URL = (os.getenv("STREAMING_SERVER_BASE_URL") or "").strip()
     if not STREAMING_SERVER_BASE_URL:
         # fallback to default url
         STREAMING_SERVER_BASE_URL = "http://emotression.iik.ntnu.no"
     STREAMING_HTTP_URL = STREAMING_SERVER_BASE_URL.rstrip("/")
+    # Frame/background uploads over a raw keep-alive socket (plain-HTTP server on the LAN)
+    RAW_SOCKET_UPLOADS = (os.getenv("RAW_SOCKET_UPLOADS") or "").strip().lower() in ("1", "true", "yes")
     _log(
         "INFO",
         (
             "Effective streaming config: "
             f"STREAMING_SERVER_BASE_URL={STREAMING_SERVER_BASE_URL}, "
-            f"STREAMING_HTTP_URL={STREAMING_HTTP_URL}"
+            f"STREAMING_HTTP_URL={STREAMING_HTTP_URL}, "
+            f"RAW_SOCKET_UPLOADS={RAW_SOCKET_UPLOADS}"
         )
     )
 
@@ -113,6 +118,7 @@ def configure_env(path):
 # ============================================
 STREAMING_SERVER_BASE_URL = None
 STREAMING_HTTP_URL = None
+RAW_SOCKET_UPLOADS = False
 
 # Best-effort bootstrap: load common .env paths before strict validation.
 for _default_env_path in ("/root/.env", ".env"):
@@ -127,6 +133,9 @@ reload_from_env()
 CAMERA_INFO_FILE = "/root/camera_info.json"
 CAMERA_ID = None
 CAMERA_NAME = None
+# Registration retries (server unreachable/refusing) back off exponentially
+REGISTRATION_RETRY_MIN_S = 1
+REGISTRATION_RETRY_MAX_S = 60
 
 # ============================================
 # RECORDING PARAMETERS
@@ -141,6 +150,34 @@ UPDATE_INTERVAL_MS = 10000
 NO_HUMAN_CONFIRM_FRAMES = 10
 STEP = 8
 
+# Pose extraction is skipped while the person detector sees nobody, except on
+# every Nth frame in case the detector missed someone
+POSE_RECHECK_EVERY_N_FRAMES = 10
+
+# ============================================
+# GARBAGE COLLECTION
+# ============================================
+# Automatic collection is disabled in the main loop; the young generation is
+# collected at the end of a frame once this many tracked objects have been
+# allocated since the last collection
+GC_GEN0_THRESHOLD = 2000
+# Collect an older generation after this many collections of the one below it
+# (CPython's default ratio)
+GC_OLDER_THRESHOLD = 10
+# Older-generation passes are slower, so they wait for a frame that finished
+# with at least GC_MIN_SLACK_MS of GC_FRAME_BUDGET_MS to spare; once twice
+# overdue they run regardless
+GC_FRAME_BUDGET_MS = 33
+GC_MIN_SLACK_MS = 3
+
+# ============================================
+# MODEL PATHS
+# ============================================
+# Paths of the .mud model bundles; point these at a rebuilt bundle to swap
+# models, the runtime calls stay the same.
+POSE_MODEL_PATH = "/root/models/yolo11n_pose.mud"
+DETECTOR_MODEL_PATH = "/root/models/yolo11n.mud"
+
 # ============================================
 # ASYNC WORKER SETTINGS
 # ============================================
@@ -148,6 +185,17 @@ FLAG_SYNC_INTERVAL_MS = 1000
 SAFE_AREA_SYNC_INTERVAL_MS = 5000
 STATE_REPORT_INTERVAL_MS = 30000
 FRAME_UPLOAD_INTERVAL_MS = 500
+# Background uploads that get no response or a 5xx are retried with
+# exponential backoff, then dropped; other errors drop them at once
+BACKGROUND_UPLOAD_RETRY_MIN_S = 0.5
+BACKGROUND_UPLOAD_RETRY_MAX_S = 8
+BACKGROUND_UPLOAD_MAX_ATTEMPTS = 5
+# Reuse the last raw-frame JPEG while the scene is unchanged, up to this age
+RAW_JPEG_CACHE_MS = 5000
+# Side length of the thumbnail hashed to detect scene changes
+FRAME_SIGNATURE_SIZE = 32
+# The overlay clock (HH:MM, fetched from the server) is refreshed at this interval
+TIME_OVERLAY_REFRESH_MS = 5000
 
 # ============================================
 # LOCAL FILE PATHS
@@ -157,9 +205,6 @@ SAFE_AREA_FILE = "/root/safe_areas.json"
 BACKGROUND_PATH = "/root/static/background.jpg"
 LOCAL_PORT = 8080
 
-# Garbage Collection
-GC_INTERVAL_MS = 30000
-
 # Pose Analysis
 POSE_ANALYSIS_INTERVAL_MS = 50
 
@@ -202,7 +247,11 @@ def load_camera_info():
     return None, None, "unregistered", "", 0
 
 def save_camera_info(camera_id, camera_name, registration_status, ip_address=""):
-    """Save camera ID and name to local file"""
+    """Queue camera ID and name to be saved to local file
+
+    Returns:
+        Future: see write_file_async(); None if the write could not be queued
+    """
     try:
         data = {
             "camera_id": camera_id,
@@ -214,13 +263,12 @@ def save_camera_info(camera_id, camera_name, registration_status, ip_address="")
             "saved_locally": True
         }
 
-        with open(CAMERA_INFO_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
-        _log("INFO", f"Camera info saved: {camera_name} ({camera_id}) - Status: {registration_status}")
-        return True
+        future = write_file_async(CAMERA_INFO_FILE, json_dumps_indent_bytes(data))
+        _log("INFO", f"Camera info queued for saving: {camera_name} ({camera_id}) - Status: {registration_status}")
+        return future
     except Exception as e:
         _log("ERROR", f"Error saving camera info: {e}")
-        return False
+        return None
 
 def register_with_streaming_server(existing_camera_id=None):
     """Register camera with streaming server (now handles all camera management)"""
@@ -240,7 +288,7 @@ def register_with_streaming_server(existing_camera_id=None):
         _log("INFO", f"Registering with streaming server: {url} params={params} from IP: {local_ip}")
         # debug_print("INFO", "API_REQUEST", "%s | endpoint: /api/stream/register | params: %s", "POST", str(params))
 
-        response = requests.post(
+        response = http_session.post(
             url,
             params=params,
             timeout=5.0
@@ -250,7 +298,7 @@ def register_with_streaming_server(existing_camera_id=None):
             _log("INFO", f"Registration failed: HTTP {response.status_code}")
             return "camera_000", "Unnamed Camera", "unregistered", local_ip
 
-        result = response.json()
+        result = json_loads(response.content)
 
         status = result.get("status", "unknown")
         camera_id = result.get("camera_id", "camera_000")
@@ -280,13 +328,13 @@ def check_registration_status(camera_id):
         _log("INFO", "Checking registration status on streaming server...")
         # debug_print("INFO", "API_REQUEST", "%s | endpoint: /api/stream/registered", "GET")
 
-        response = requests.get(url, timeout=3.0)
+        response = http_session.get(url, timeout=3.0)
 
         if response.status_code != 200:
             _log("INFO", f"Failed to check registration: HTTP {response.status_code}")
             return "unknown"
 
-        result = response.json()
+        result = json_loads(response.content)
         cameras = result.get("cameras", [])
 
         # Camera IP seen by the server != local IP → only check camera_id
@@ -6,6 +6,8 @@ import time
 import threading
 from debug_config import DebugLogger
 from tools.polygon_checker import CheckMethod
+from tools.file_writer import write_file_async
+from tools.json_codec import dumps_indent_bytes as json_dumps_indent_bytes
 
 # Module-level debug logger instance
 logger = DebugLogger(tag="CTRL_MGR", instance_enable=False)
@@ -181,7 +183,12 @@ def notify_flag_change(flag_name, value):
         callback(flag_name, value)
 
 def save_control_flags():
-    """Save control flags to local storage"""
+    """Queue the control flags to be saved to local storage
+
+    Returns:
+        Future: see write_file_async(); None if the flags could not be
+            serialized
+    """
     try:
         flags_data = {
             "control_flags": control_flags,
@@ -190,14 +197,14 @@ def save_control_flags():
             "saved_locally": True
         }
         
-        with open(LOCAL_FLAGS_FILE, 'w') as f:
-            json.dump(flags_data, f, indent=2)
-        logger.print("FLAGS", "Control flags saved locally to %s", LOCAL_FLAGS_FILE)
-        return True
+        # Serialized here (a snapshot of the flags); the file is written off the main loop
+        future = write_file_async(LOCAL_FLAGS_FILE, json_dumps_indent_bytes(flags_data))
+        logger.print("FLAGS", "Control flags queued for saving to %s", LOCAL_FLAGS_FILE)
+        return future
         
     except Exception as e:
         logger.print("FLAGS", "Error saving control flags: %s", e)
-        return False
+        return None
 
 def load_initial_flags():
     """Load initial flags from local storage"""
@@ -338,15 +345,18 @@ def load_bed_areas():
         return []
 
 def save_bed_areas(bed_areas):
-    """Save bed areas to JSON file"""
+    """Queue bed areas to be saved to JSON file
+
+    Returns:
+        Future: see write_file_async(); None if the write could not be queued
+    """
     try:
-        with open(BED_AREA_FILE, 'w') as f:
-            json.dump(bed_areas, f, indent=2)
-        logger.print("BED_AREA", "Saved %d bed area(s) to file", len(bed_areas))
-        return True
+        future = write_file_async(BED_AREA_FILE, json_dumps_indent_bytes(bed_areas))
+        logger.print("BED_AREA", "Queued %d bed area(s) for saving", len(bed_areas))
+        return future
     except Exception as e:
         logger.print("BED_AREA", "Error saving bed areas: %s", e)
-        return False
+        return None
 
 def update_bed_area_polygons(bed_areas):
     global bed_area_checker
@@ -424,15 +434,18 @@ def load_floor_areas():
         return []
 
 def save_floor_areas(floor_areas):
-    """Save floor areas to JSON file"""
+    """Queue floor areas to be saved to JSON file
+
+    Returns:
+        Future: see write_file_async(); None if the write could not be queued
+    """
     try:
-        with open(FLOOR_AREA_FILE, 'w') as f:
-            json.dump(floor_areas, f, indent=2)
-        logger.print("FLOOR_AREA", "Saved %d floor area(s) to file", len(floor_areas))
-        return True
+        future = write_file_async(FLOOR_AREA_FILE, json_dumps_indent_bytes(floor_areas))
+        logger.print("FLOOR_AREA", "Queued %d floor area(s) for saving", len(floor_areas))
+        return future
     except Exception as e:
         logger.print("FLOOR_AREA", "Error saving floor areas: %s", e)
-        return False
+        return None
 
 def update_floor_area_polygons(floor_areas):
     global floor_area_checker
@@ -510,15 +523,18 @@ def load_chair_areas():
         return []
 
 def save_chair_areas(chair_areas):
-    """Save chair areas to JSON file"""
+    """Queue chair areas to be saved to JSON file
+
+    Returns:
+        Future: see write_file_async(); None if the write could not be queued
+    """
     try:
-        with open(CHAIR_AREA_FILE, 'w') as f:
-            json.dump(chair_areas, f, indent=2)
-        logger.print("CHAIR_AREA", "Saved %d chair area(s) to file", len(chair_areas))
-        return True
+        future = write_file_async(CHAIR_AREA_FILE, json_dumps_indent_bytes(chair_areas))
+        logger.print("CHAIR_AREA", "Queued %d chair area(s) for saving", len(chair_areas))
+        return future
     except Exception as e:
         logger.print("CHAIR_AREA", "Error saving chair areas: %s", e)
-        return False
+        return None
 
 def update_chair_area_polygons(chair_areas):
     global chair_area_checker
@@ -596,15 +612,18 @@ def load_couch_areas():
         return []
 
 def save_couch_areas(couch_areas):
-    """Save couch areas to JSON file"""
+    """Queue couch areas to be saved to JSON file
+
+    Returns:
+        Future: see write_file_async(); None if the write could not be queued
+    """
     try:
-        with open(COUCH_AREA_FILE, 'w') as f:
-            json.dump(couch_areas, f, indent=2)
-        logger.print("COUCH_AREA", "Saved %d couch area(s) to file", len(couch_areas))
-        return True
+        future = write_file_async(COUCH_AREA_FILE, json_dumps_indent_bytes(couch_areas))
+        logger.print("COUCH_AREA", "Queued %d couch area(s) for saving", len(couch_areas))
+        return future
     except Exception as e:
         logger.print("COUCH_AREA", "Error saving couch areas: %s", e)
-        return False
+        return None
 
 def update_couch_area_polygons(couch_areas):
     global couch_area_checker
@@ -682,15 +701,18 @@ def load_bench_areas():
         return []
 
 def save_bench_areas(bench_areas):
-    """Save bench areas to JSON file"""
+    """Queue bench areas to be saved to JSON file
+
+    Returns:
+        Future: see write_file_async(); None if the write could not be queued
+    """
     try:
-        with open(BENCH_AREA_FILE, 'w') as f:
-            json.dump(bench_areas, f, indent=2)
-        logger.print("BENCH_AREA", "Saved %d bench area(s) to file", len(bench_areas))
-        return True
+        future = write_file_async(BENCH_AREA_FILE, json_dumps_indent_bytes(bench_areas))
+        logger.print("BENCH_AREA", "Queued %d bench area(s) for saving", len(bench_areas))
+        return future
     except Exception as e:
         logger.print("BENCH_AREA", "Error saving bench areas: %s", e)
-        return False
+        return None
 
 def update_bench_area_polygons(bench_areas):
     global bench_area_checker
@@ -742,7 +764,8 @@ def save_all_bench_areas():
 # STREAMING SERVER COMMUNICATION (Camera State & Safe Areas)
 # ============================================
 
-import requests
+from tools.http_client import session as http_session
+from tools.json_codec import dumps_bytes as json_dumps_bytes, loads as json_loads
 
 # Import STREAMING_HTTP_URL here to avoid circular import
 def _get_streaming_http_url():
@@ -750,6 +773,21 @@ def _get_streaming_http_url():
     from config import STREAMING_HTTP_URL
     return STREAMING_HTTP_URL
 
+# Endpoint URLs never change after startup except through the camera ID, so
+# each (path, camera_id) URL is built once instead of on every poll
+_api_urls = {}
+
+def _api_url(path, camera_id=None):
+    """Full streaming server URL for path, with ?camera_id=... when given"""
+    key = (path, camera_id)
+    url = _api_urls.get(key)
+    if url is None:
+        url = _get_streaming_http_url() + path
+        if camera_id is not None:
+            url += f"?camera_id={camera_id}"
+        _api_urls[key] = url
+    return url
+
 # Get camera_id from CameraStateManager instead of direct import
 def get_current_camera_id():
     """Get current camera ID from CameraStateManager"""
@@ -759,17 +797,16 @@ def send_background_updated(timestamp):
     """Notify streaming server that background was updated"""
     try:
         camera_id = get_current_camera_id()
-        STREAMING_HTTP_URL = _get_streaming_http_url()
-        url = f"{STREAMING_HTTP_URL}/api/stream/command"
+        url = _api_url("/api/stream/command")
         payload = {
             "CameraId": camera_id,
             "Command": "background_updated",
             "Value": {"timestamp": timestamp}
         }
         logger.print("API_REQUEST", "%s | endpoint: /api/stream/command | payload: %s", "POST", str(payload)[:100])
-        response = requests.post(
+        response = http_session.post(
             url,
-            json=payload,
+            data=json_dumps_bytes(payload),
             headers={'Content-Type': 'application/json'},
             timeout=2.0
         )
@@ -782,12 +819,11 @@ def get_camera_state_from_server():
     """Get camera state (including control flags) from streaming server"""
     try:
         camera_id = get_current_camera_id()
-        STREAMING_HTTP_URL = _get_streaming_http_url()
-        url = f"{STREAMING_HTTP_URL}/api/stream/camera-state?camera_id={camera_id}"
+        url = _api_url("/api/stream/camera-state", camera_id)
         logger.print("API_REQUEST", "%s | endpoint: /api/stream/camera-state | params: camera_id=%s", "GET", camera_id)
-        response = requests.get(url, timeout=2.0)
+        response = http_session.get(url, timeout=2.0)
         if response.status_code == 200:
-            return response.json()
+            return json_loads(response.content)
         return None
     except Exception as e:
         logger.print("CTRL_MGR", "Get camera state error: %s", e)
@@ -798,12 +834,11 @@ def get_bed_areas_from_server():
     """Get bed areas from streaming server"""
     try:
         camera_id = get_current_camera_id()
-        STREAMING_HTTP_URL = _get_streaming_http_url()
-        url = f"{STREAMING_HTTP_URL}/api/stream/bed-areas?camera_id={camera_id}"
+        url = _api_url("/api/stream/bed-areas", camera_id)
         logger.print("API_REQUEST", "%s | endpoint: /api/stream/bed-areas | params: camera_id=%s", "GET", camera_id)
-        response = requests.get(url, timeout=2.0)
+        response = http_session.get(url, timeout=2.0)
         if response.status_code == 200:
-            return response.json()
+            return json_loads(response.content)
         return []
     except Exception as e:
         logger.print("CTRL_MGR", "Get bed areas error: %s", e)
@@ -813,12 +848,11 @@ def get_floor_areas_from_server():
     """Get floor areas from streaming server"""
     try:
         camera_id = get_current_camera_id()
-        STREAMING_HTTP_URL = _get_streaming_http_url()
-        url = f"{STREAMING_HTTP_URL}/api/stream/floor-areas?camera_id={camera_id}"
+        url = _api_url("/api/stream/floor-areas", camera_id)
         logger.print("API_REQUEST", "%s | endpoint: /api/stream/floor-areas | params: camera_id=%s", "GET", camera_id)
-        response = requests.get(url, timeout=2.0)
+        response = http_session.get(url, timeout=2.0)
         if response.status_code == 200:
-            return response.json()
+            return json_loads(response.content)
         return []
     except Exception as e:
         logger.print("CTRL_MGR", "Get floor areas error: %s", e)
@@ -828,12 +862,11 @@ def get_chair_areas_from_server():
     """Get chair areas from streaming server"""
     try:
         camera_id = get_current_camera_id()
-        STREAMING_HTTP_URL = _get_streaming_http_url()
-        url = f"{STREAMING_HTTP_URL}/api/stream/chair-areas?camera_id={camera_id}"
+        url = _api_url("/api/stream/chair-areas", camera_id)
         logger.print("API_REQUEST", "%s | endpoint: /api/stream/chair-areas | params: camera_id=%s", "GET", camera_id)
-        response = requests.get(url, timeout=2.0)
+        response = http_session.get(url, timeout=2.0)
         if response.status_code == 200:
-            return response.json()
+            return json_loads(response.content)
         return []
     except Exception as e:
         logger.print("CTRL_MGR", "Get chair areas error: %s", e)
@@ -843,12 +876,11 @@ def get_couch_areas_from_server():
     """Get couch areas from streaming server"""
     try:
         camera_id = get_current_camera_id()
-        STREAMING_HTTP_URL = _get_streaming_http_url()
-        url = f"{STREAMING_HTTP_URL}/api/stream/couch-areas?camera_id={camera_id}"
+        url = _api_url("/api/stream/couch-areas", camera_id)
         logger.print("API_REQUEST", "%s | endpoint: /api/stream/couch-areas | params: camera_id=%s", "GET", camera_id)
-        response = requests.get(url, timeout=2.0)
+        response = http_session.get(url, timeout=2.0)
         if response.status_code == 200:
-            return response.json()
+            return json_loads(response.content)
         return []
     except Exception as e:
         logger.print("CTRL_MGR", "Get couch areas error: %s", e)
@@ -858,12 +890,11 @@ def get_bench_areas_from_server():
     """Get bench areas from streaming server"""
     try:
         camera_id = get_current_camera_id()
-        STREAMING_HTTP_URL = _get_streaming_http_url()
-        url = f"{STREAMING_HTTP_URL}/api/stream/bench-areas?camera_id={camera_id}"
+        url = _api_url("/api/stream/bench-areas", camera_id)
         logger.print("API_REQUEST", "%s | endpoint: /api/stream/bench-areas | params: camera_id=%s", "GET", camera_id)
-        response = requests.get(url, timeout=2.0)
+        response = http_session.get(url, timeout=2.0)
         if response.status_code == 200:
-            return response.json()
+            return json_loads(response.content)
         return []
     except Exception as e:
         logger.print("CTRL_MGR", "Get bench areas error: %s", e)
@@ -872,24 +903,23 @@ def get_bench_areas_from_server():
 def report_state(rtmp_connected=False, is_recording=False):
     """Report camera state to streaming server (async)
     
-    Note: This is called from StateReporterWorker which already runs in a separate thread,
-    but we make the request itself async to avoid blocking the worker thread.
+    Note: This is called from the CommandReceiver loop (report_current_state), so the
+    request itself runs on its own thread to avoid blocking command handling.
     """
     def _send():
         try:
             camera_id = get_current_camera_id()
-            STREAMING_HTTP_URL = _get_streaming_http_url()
             state_report = {
                 "camera_id": camera_id,
                 "status": "online",
                 "timestamp": int(time.time() * 1000),
                 "is_recording": is_recording
             }
-            url = f"{STREAMING_HTTP_URL}/api/stream/report-state"
+            url = _api_url("/api/stream/report-state")
             logger.print("API_REQUEST", "%s | endpoint: /api/stream/report-state | payload: %s", "POST", str(state_report)[:100])
-            requests.post(
+            http_session.post(
                 url,
-                json=state_report,
+                data=json_dumps_bytes(state_report),
                 headers={'Content-Type': 'application/json'},
                 timeout=2.0
             )
@@ -5,9 +5,9 @@ import os
 import sys
 import queue
 import gc
-import time as py_time
 import numpy as np
 import cv2
+from concurrent.futures import ThreadPoolExecutor
 
 # ============================================
 # MOCK MAIX MODULE (To prevent hardware access)
@@ -53,9 +53,22 @@ class PCByteTracker:
 tracker_module.ByteTracker = PCByteTracker
 tracker_module.Object = PCTrackerObject
 
+# Create a module-like object for maix.app (mirrors the SDK exit-flag API)
+app_module = types.ModuleType("maix.app")
+app_module._exit_flag = False
+
+def _need_exit():
+    return app_module._exit_flag
+
+def _set_exit_flag(exit_flag):
+    app_module._exit_flag = bool(exit_flag)
+
+app_module.need_exit = _need_exit
+app_module.set_exit_flag = _set_exit_flag
+
 sys.modules["maix"] = MagicMock()
-sys.modules["maix.app"] = MagicMock()
-sys.modules["maix.app"].need_exit.return_value = False
+sys.modules["maix.app"] = app_module
+sys.modules["maix"].app = app_module
 sys.modules["maix.time"] = MagicMock()
 sys.modules["maix.image"] = MagicMock()
 sys.modules["maix.display"] = MagicMock()
@@ -91,7 +104,7 @@ os.makedirs("./extracted-skeleton-2d", exist_ok=True)
 import pc_camera_manager as camera_manager
 from pc_video_record import VideoRecorder
 
-from debug_config import DebugLogger
+from debug_config import DebugLogger, PERF_ENABLED
 # tools.wifi_connect skipped on PC
 from tools.skeleton_saver import SkeletonSaver2D
 from tools.bed_area_checker import BedAreaChecker
@@ -101,13 +114,17 @@ from tools.chair_area_checker import ChairAreaChecker
 from tools.couch_area_checker import CouchAreaChecker
 from tools.bench_area_checker import BenchAreaChecker
 from tools.safety_judgment import SafetyJudgment
+from tools.file_writer import write_file_async, flush_writes
 
 from config import (
     initialize_camera, save_camera_info, STREAMING_HTTP_URL,
-    BACKGROUND_PATH, MIN_HUMAN_FRAMES_TO_START, NO_HUMAN_FRAMES_TO_STOP,
+    BACKGROUND_PATH, MIN_HUMAN_FRAMES_TO_START,
     MAX_RECORDING_DURATION_MS, UPDATE_INTERVAL_MS, NO_HUMAN_CONFIRM_FRAMES,
-    GC_INTERVAL_MS, NO_HUMAN_SECONDS_TO_STOP
+    NO_HUMAN_SECONDS_TO_STOP,
+    RAW_JPEG_CACHE_MS, FRAME_SIGNATURE_SIZE,
+    GC_GEN0_THRESHOLD, GC_OLDER_THRESHOLD, GC_FRAME_BUDGET_MS, GC_MIN_SLACK_MS, STATE_REPORT_INTERVAL_MS
 )
+from streaming import frame_signature
 
 
 
@@ -117,8 +134,8 @@ from config import (
 from pc_camera_manager import initialize_cameras, load_fonts
 
 from control_manager import (
-    load_initial_flags, get_control_flags, send_background_updated, update_control_flags_from_server,
-    update_control_flag, get_flag, register_status_change_callback,
+    load_initial_flags, get_control_flags, update_control_flags_from_server,
+    update_control_flag, register_status_change_callback,
     initialize_bed_area_checker, update_bed_area_polygons, load_bed_areas,
     initialize_floor_area_checker, update_floor_area_polygons, load_floor_areas,
     initialize_chair_area_checker, update_chair_area_polygons, load_chair_areas,
@@ -127,8 +144,9 @@ from control_manager import (
     CameraStateManager
 )
 from workers import (
-    CameraStateSyncWorker, StateReporterWorker, FrameUploadWorker,
-    CommandReceiver, PingWorker, get_received_commands, handle_command,
+    CameraStateSyncWorker, FrameUploadWorker, report_current_state,
+    CommandReceiver, PingWorker, StatusLoggerWorker,
+    get_received_commands, handle_command,
     update_is_recording,
     TracksSenderWorker,
     set_tracks_worker, update_latest_tracks, mark_tracks_as_ready
@@ -140,10 +158,24 @@ from tools.time_utils import time_ms, TaskProfiler, get_timestamp_str
 
 logger = DebugLogger("MAIN", instance_enable=False)
 
+# libjpeg-turbo (SIMD) encoder when the turbojpeg binding and library are
+# installed; cv2.imencode otherwise
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbo_jpeg = None
+
 # ============================================
 # HELPER FUNCTIONS
 # ============================================
 
+def encode_jpeg(frame, quality):
+    """JPEG-encode a BGR frame, same (success, buffer) result as cv2.imencode"""
+    if _turbo_jpeg is not None:
+        return True, _turbo_jpeg.encode(frame, quality=quality, jpeg_subsample=TJSAMP_420)
+    return cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+
 def merge_background_with_mask(old_background, new_frame, processed_tracks, padding=20):
     """Merge old background with new frame, masking out areas where humans are present.
 
@@ -171,8 +203,8 @@ def merge_background_with_mask(old_background, new_frame, processed_tracks, padd
     # Black (0,0,0) = unmasked, White (255,255,255) = body, Red (255,0,0) = head
     mask_vis = np.zeros((height, width, 3), dtype=np.uint8)
 
-    # Create binary mask for merging
-    mask_binary = np.zeros((height, width), dtype=np.uint8)
+    # Create boolean mask for merging (True = human area)
+    mask_binary = np.zeros((height, width), dtype=bool)
 
     # For each track, mask body bbox and head area
     for track in processed_tracks:
@@ -190,7 +222,7 @@ def merge_background_with_mask(old_background, new_frame, processed_tracks, padd
         x2 = min(width, int(x + w + padding))
         y2 = min(height, int(y + h + padding))
 
-        mask_binary[y1:y2, x1:x2] = 255
+        mask_binary[y1:y2, x1:x2] = True
         # Mark in visualization (white = body)
         mask_vis[y1:y2, x1:x2] = [255, 255, 255]
 
@@ -242,17 +274,55 @@ def merge_background_with_mask(old_background, new_frame, processed_tracks, padd
                 head_y2 = min(height, head_y2)
 
                 # Set head region in mask
-                mask_binary[head_y1:head_y2, head_x1:head_x2] = 255
+                mask_binary[head_y1:head_y2, head_x1:head_x2] = True
                 # Mark in visualization (red = head)
                 mask_vis[head_y1:head_y2, head_x1:head_x2] = [255, 0, 0]
 
-    # Where mask is white (human areas), use old_background
-    # Where mask is black (no humans), use new_frame (already set as merged)
-    mask_3ch = cv2.cvtColor(mask_binary, cv2.COLOR_GRAY2BGR)
-    merged = np.where(mask_3ch == 255, old_background, merged)
+    # Where mask is set (human areas), copy old_background over the new frame
+    # in place; elsewhere merged already holds new_frame. Boolean indexing on
+    # the HxW mask selects whole pixels, so no 3-channel mask is needed.
+    merged[mask_binary] = old_background[mask_binary]
 
     return merged, mask_vis
 
+def save_and_upload_background(background_img, frame_upload_worker, upload, notify=False):
+    """Encode the background once, save it on the disk writer thread and optionally queue it for upload
+
+    With `notify`, the upload worker tells the server about the new background
+    once the upload has gone through.
+
+    Returns:
+        bool: True if the background was encoded and queued
+    """
+    success, jpeg_bytes = encode_jpeg(background_img, 70)
+    if not success:
+        logger.print("MAIN", "[BACKGROUND] Failed to encode background")
+        return False
+
+    jpeg_view = memoryview(jpeg_bytes).cast("B")
+    write_file_async(BACKGROUND_PATH, jpeg_view)
+    if upload:
+        frame_upload_worker.update_background(jpeg_view, notify=notify)
+    return True
+
+def collect_garbage_if_needed(frame_elapsed_ms):
+    """Run the collection the interpreter would have run on its own, at a frame boundary
+
+    Automatic GC is disabled, so this is the only place cycles are collected.
+    Only the young generation is scanned unless an older one is due; a due
+    older generation is put off while the frame has used up its budget.
+    """
+    gen0, gen1, gen2 = gc.get_count()
+    if gen0 < GC_GEN0_THRESHOLD:
+        return
+    has_slack = GC_FRAME_BUDGET_MS - frame_elapsed_ms >= GC_MIN_SLACK_MS
+    if gen2 >= GC_OLDER_THRESHOLD and (has_slack or gen2 >= 2 * GC_OLDER_THRESHOLD):
+        gc.collect(2)
+    elif gen1 >= GC_OLDER_THRESHOLD and (has_slack or gen1 >= 2 * GC_OLDER_THRESHOLD):
+        gc.collect(1)
+    else:
+        gc.collect(0)
+
 # ============================================
 # MAIN INITIALIZATION
 # ============================================
@@ -372,10 +442,11 @@ def main():
     chair_areas_queue = queue.Queue(maxsize=5)
     couch_areas_queue = queue.Queue(maxsize=5)
     bench_areas_queue = queue.Queue(maxsize=5)
-    tracks_queue = queue.Queue(maxsize=30)  # Queue for tracks sender
 
     # Start command server (might conflict on port 8080 if running on PC, but we'll try)
     command_receiver = CommandReceiver()
+    # State reports (heartbeat) go out from the command server loop
+    command_receiver.schedule(STATE_REPORT_INTERVAL_MS / 1000.0, report_current_state)
     command_receiver.start()
 
     # Start async workers
@@ -386,18 +457,18 @@ def main():
         chair_areas_queue=chair_areas_queue, couch_areas_queue=couch_areas_queue,
         bench_areas_queue=bench_areas_queue
     )
-    state_reporter_worker = StateReporterWorker(STREAMING_HTTP_URL, CAMERA_ID)
-    frame_upload_worker = FrameUploadWorker(STREAMING_HTTP_URL, CAMERA_ID, profiler_enabled=True)
+    frame_upload_worker = FrameUploadWorker(STREAMING_HTTP_URL, CAMERA_ID, profiler_enabled=PERF_ENABLED)
     ping_worker = PingWorker(STREAMING_HTTP_URL, CAMERA_ID)
+    status_logger = StatusLoggerWorker()
     
     flag_sync_worker.start()
-    state_reporter_worker.start()
     frame_upload_worker.start()
     ping_worker.start()
+    status_logger.start()
     
 
     # Start Tracks Sender Worker
-    tracks_sender = TracksSenderWorker(CAMERA_ID, profiler_enabled=False)
+    tracks_sender = TracksSenderWorker(CAMERA_ID, profiler_enabled=PERF_ENABLED)
     set_tracks_worker(tracks_sender)
     tracks_sender.start()
     logger.print("MAIN", "[TracksSender] Worker started")
@@ -422,7 +493,9 @@ def main():
     # STATE VARIABLES
     # ============================================
     frame_id = 0
-    human_presence_history = []
+    # Lengths of the current run of frames with / without a human present
+    human_present_streak = 0
+    no_human_streak = 0
     recording_start_time = 0
     is_recording = False
     background_update_in_progress = False
@@ -431,9 +504,8 @@ def main():
     prev_human_present = False
     no_human_counter = 0
     last_update_ms = time_ms()
-    last_gc_time = time_ms()
     streaming_server_available = True
-    frame_profiler = TaskProfiler(task_name="Main", enabled=True)
+    frame_profiler = TaskProfiler(task_name="Main", enabled=PERF_ENABLED)
     frame_profiler.register_subtasks([
         "async_updates",
         "commands",
@@ -453,9 +525,23 @@ def main():
     cached_tracks = None
     cached_tracks_timeout = 3000 # 3s
     cached_tracks_last_updated = 0
-    raw_upload_interval_public_ms = 100
-    raw_upload_interval_private_ms = 5000
+    raw_upload_interval_ms = 100
     last_raw_upload_ms = 0
+
+    # Raw-frame JPEG encoding runs on a helper thread so it overlaps with the
+    # next iteration; the result is picked up (and uploaded) a frame later.
+    raw_encode_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="raw_jpeg")
+    raw_encode_future = None
+    raw_jpeg_quality = 60
+    # Encoder input, reused across encodes: the raw frame is copied into it
+    # rather than into a fresh array each time. Only written when no raw
+    # encode is in flight.
+    raw_encode_input = None
+    # Last encoded raw frame, reused while the scene signature is unchanged
+    last_raw_jpeg = None
+    last_raw_signature = None
+    last_raw_encode_ms = 0
+    pending_raw_signature = None
     
     # ============================================
     # MAIN LOOP
@@ -480,22 +566,33 @@ def main():
     # Upload background image to server at startup
     if streaming_server_available and background_img is not None:
         try:
-            # OpenCV JPEG encoding
-            success, jpeg_bytes = cv2.imencode('.jpg', background_img, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
+            success, jpeg_bytes = encode_jpeg(background_img, 70)
             if success:
-                frame_upload_worker.update_background(jpeg_bytes.tobytes())
+                frame_upload_worker.update_background(memoryview(jpeg_bytes).cast("B"))
                 logger.print("MAIN", "[BACKGROUND] Background queued for upload at startup")
         except Exception as e:
             logger.print("MAIN", "[BACKGROUND] Failed to queue background for upload at startup: %s", e)
     
+    # Collect the startup garbage once, then move everything that's alive now
+    # (models, workers, background) out of the collector's view. Reference
+    # counting frees the per-frame objects; there is no periodic full collect.
+    gc.collect()
+    gc.freeze()
+    # Cyclic garbage is collected at frame boundaries only, when enough
+    # objects have been allocated to be worth a pass (collect_garbage_if_needed)
+    gc.disable()
+    
     while True:
         # Start frame profiling
         frame_profiler.start_frame()
+
+        # Single timestamp for every timer in this iteration
+        now_ms = time_ms()
         
         # 1. Process async updates from workers
         frame_profiler.start_task("async_updates")
         try:
-            while not flags_queue.empty():
+            while True:
                 msg_type, data = flags_queue.get_nowait()
                 if msg_type == "flags_update":
                     flags_updated = update_control_flags_from_server(data)
@@ -507,7 +604,7 @@ def main():
 
 
         try:
-            while not bed_areas_queue.empty():
+            while True:
                 msg_type, data = bed_areas_queue.get_nowait()
                 if msg_type == "bed_areas_update":
                     if isinstance(data, list):
@@ -516,7 +613,7 @@ def main():
             pass
 
         try:
-            while not floor_areas_queue.empty():
+            while True:
                 msg_type, data = floor_areas_queue.get_nowait()
                 if msg_type == "floor_areas_update":
                     if isinstance(data, list):
@@ -525,7 +622,7 @@ def main():
             pass
 
         try:
-            while not chair_areas_queue.empty():
+            while True:
                 msg_type, data = chair_areas_queue.get_nowait()
                 if msg_type == "chair_areas_update":
                     if isinstance(data, list):
@@ -534,7 +631,7 @@ def main():
             pass
 
         try:
-            while not couch_areas_queue.empty():
+            while True:
                 msg_type, data = couch_areas_queue.get_nowait()
                 if msg_type == "couch_areas_update":
                     if isinstance(data, list):
@@ -543,7 +640,7 @@ def main():
             pass
 
         try:
-            while not bench_areas_queue.empty():
+            while True:
                 msg_type, data = bench_areas_queue.get_nowait()
                 if msg_type == "bench_areas_update":
                     if isinstance(data, list):
@@ -566,6 +663,12 @@ def main():
             if cmd_data.get("command") == "approve_camera":
                 camera_state_manager.set_registration_status("registered")
         frame_profiler.end_task("commands")
+
+        # Snapshot the flags once per frame, after server and command updates
+        frame_flags = get_control_flags()
+        show_raw = frame_flags.get("show_raw", False)
+        auto_update_bg = frame_flags.get("auto_update_bg", False)
+        record_flag = frame_flags.get("record", False)
         
         # 3. Camera Read
         raw_img = cam.read()
@@ -574,22 +677,15 @@ def main():
             
         # 4. Check for background update request
         frame_profiler.start_task("background_check")
-        if get_flag("set_background", False) and not background_update_in_progress and not get_flag("_background_update_pending", False):
+        if frame_flags.get("set_background", False) and not background_update_in_progress and not frame_flags.get("_background_update_pending", False):
             logger.print("MAIN", "[BACKGROUND] Starting background update...")
             background_img = raw_img.copy()
-            cv2.imwrite(BACKGROUND_PATH, background_img)
             background_update_in_progress = True
             update_control_flag("set_background", False)
-            # Upload background image to server via FrameUploadWorker
-            if streaming_server_available:
-                try:
-                    success, jpeg_bytes = cv2.imencode('.jpg', background_img, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
-                    if success:
-                        frame_upload_worker.update_background(jpeg_bytes.tobytes())
-                        logger.print("MAIN", "[BACKGROUND] Background queued for upload to server")
-                except Exception as e:
-                    logger.print("MAIN", "[BACKGROUND] Failed to queue background for upload: %s", e)
-            send_background_updated(py_time.time())
+            # Save locally (disk writer thread) and upload via FrameUploadWorker
+            if save_and_upload_background(background_img, frame_upload_worker, streaming_server_available, notify=True):
+                if streaming_server_available:
+                    logger.print("MAIN", "[BACKGROUND] Background queued for upload to server")
             background_update_in_progress = False
             logger.print("MAIN", "[BACKGROUND] Background updated")
         frame_profiler.end_task("background_check")
@@ -603,27 +699,21 @@ def main():
         frame_profiler.end_task("pose_extraction")
 
         # 5b. Auto background update logic (using pose detection results)
-        if get_flag("auto_update_bg", False):
+        if auto_update_bg:
             if prev_human_present and not current_human_present:
                 no_human_counter += 1
                 if no_human_counter >= NO_HUMAN_CONFIRM_FRAMES:
                     # No humans present, can update background immediately
                     background_img = raw_img.copy()
-                    cv2.imwrite(BACKGROUND_PATH, background_img)
-                    # Upload background image to server via FrameUploadWorker
-                    if streaming_server_available:
-                        try:
-                            success, jpeg_bytes = cv2.imencode('.jpg', background_img, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
-                            if success:
-                                frame_upload_worker.update_background(jpeg_bytes.tobytes())
-                                logger.print("MAIN", "[BACKGROUND] Auto-update background queued for upload (no humans)")
-                        except Exception as e:
-                            logger.print("MAIN", "[BACKGROUND] Auto-update failed to queue background: %s", e)
-                    last_update_ms = time_ms()
+                    # Save locally (disk writer thread) and upload via FrameUploadWorker
+                    if save_and_upload_background(background_img, frame_upload_worker, streaming_server_available):
+                        if streaming_server_available:
+                            logger.print("MAIN", "[BACKGROUND] Auto-update background queued for upload (no humans)")
+                    last_update_ms = now_ms
                     no_human_counter = 0
             else:
                 no_human_counter = 0
-                if time_ms() - last_update_ms > UPDATE_INTERVAL_MS:
+                if now_ms - last_update_ms > UPDATE_INTERVAL_MS:
                     # Periodic update - defer to after tracking so we can mask out humans
                     background_update_needed = True
                     logger.print("MAIN", "[BACKGROUND] Deferred background update scheduled (will mask human areas)")
@@ -631,7 +721,7 @@ def main():
         
         # 6. Prepare display image (no UI rendering)
         frame_profiler.start_task("display_prep")
-        if get_flag("show_raw", False):
+        if show_raw:
             img = raw_img.copy()
         else:
             img = background_img.copy() if background_img is not None else raw_img.copy()
@@ -643,46 +733,41 @@ def main():
         # pose_human_present = len(objs) > 0
         human_present = current_human_present # or pose_human_present (same thing now)
         
-        human_presence_history.append(human_present)
-        if len(human_presence_history) > NO_HUMAN_FRAMES_TO_STOP + 1:
-            human_presence_history.pop(0)
+        if human_present:
+            human_present_streak += 1
+            no_human_streak = 0
+        else:
+            human_present_streak = 0
+            no_human_streak += 1
         
         # Recording logic
-        record_flag = get_flag("record", False)
-        now = time_ms()
-        
         if record_flag and not is_recording:
-            if (len(human_presence_history) >= MIN_HUMAN_FRAMES_TO_START and 
-                all(human_presence_history[-MIN_HUMAN_FRAMES_TO_START:])):
+            if human_present_streak >= MIN_HUMAN_FRAMES_TO_START:
                 timestamp = get_timestamp_str()
                 # Use local recordings path
                 video_path = os.path.abspath(f"./recordings/{timestamp}.mp4")
                 recorder.start(video_path, pose_extractor.input_width(), pose_extractor.input_height())
                 skeleton_saver_2d.start_new_log(timestamp)
                 frame_id = 0
-                recording_start_time = now
+                recording_start_time = now_ms
                 is_recording = True
                 update_is_recording(True)
                 logger.print("MAIN", "Started recording: %s", timestamp)
         
         if is_recording:
-            no_human_count = 0
-            for presence in reversed(human_presence_history):
-                if not presence:
-                    no_human_count += 1
-                else:
-                    break
-            
             no_human_frames_to_stop = NO_HUMAN_SECONDS_TO_STOP * 60
             
-            if (no_human_count >= no_human_frames_to_stop or 
-                now - recording_start_time >= MAX_RECORDING_DURATION_MS or
+            if (no_human_streak >= no_human_frames_to_stop or 
+                now_ms - recording_start_time >= MAX_RECORDING_DURATION_MS or
                 not record_flag):
                 recorder.end()
                 skeleton_saver_2d.save_to_csv()
                 is_recording = False
                 update_is_recording(False)
                 logger.print("MAIN", "Stopped recording")
+                # The scene is quiet: a good time for the full collection that
+                # collect_garbage_if_needed() would otherwise run mid-activity
+                gc.collect()
         
         # 8. Process tracking and collect all tracks
         frame_profiler.start_task("tracking")
@@ -692,11 +777,10 @@ def main():
             frame_id += 1
 
         # Calculate FPS
-        frame_end_time = time_ms()
-        frame_duration = frame_end_time - frame_start_time
+        frame_duration = now_ms - frame_start_time
         current_fps = 1000.0 / frame_duration if frame_duration > 0 else 30.0
         set_fps(current_fps)
-        frame_start_time = frame_end_time
+        frame_start_time = now_ms
         
         processed_tracks = []
         
@@ -707,7 +791,8 @@ def main():
                 skeleton_saver=skeleton_saver_2d if is_recording else None,
                 frame_id=frame_id,
                 fps=current_fps,
-                safety_judgment=safety_judgment
+                safety_judgment=safety_judgment,
+                flags=frame_flags
             )
             
             if not track_result:
@@ -803,26 +888,11 @@ def main():
                     cv2.putText(img, f"y_top: {int(ny)}", 
                         (int(nx), int(ny)-50), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
             
-            logger.print("MAIN", "pose_label <- track_result['pose_label']: %s", track_result.get('pose_label', 'unknown'))
-            track_id = track_result.get("track_id")
-            keypoints = track_result.get("keypoints")
-            bbox = track_result.get("bbox")
-            pose_label = track_result.get("pose_label", "unknown")
-            status = track_result.get("status", "tracking")
-            safety_status = "normal" if status == "tracking" else status
-            # safety_reason already extracted above
-            int_features = track_result.get("int_features")
-
-            processed_track = {
-                "track_id": track_id,
-                "keypoints": keypoints,
-                "bbox": bbox,
-                "pose_label": pose_label,
-                "safety_status": safety_status,
-                "safety_reason": safety_reason,
-                "int_features": int_features,
-            }
-            processed_tracks.append(processed_track)
+            if logger.enable:
+                logger.print("MAIN", "pose_label <- track_result['pose_label']: %s", track_result.get('pose_label', 'unknown'))
+            # The track result is the processed track: TracksSenderWorker builds
+            # its payload from it and reads "status" as the safety status
+            processed_tracks.append(track_result)
 
         # Send tracks to queue and mark them as ready for sending
         update_latest_tracks(processed_tracks)
@@ -830,7 +900,7 @@ def main():
         
         # Cleanup cached_tracks if timeout is hit after the last cache update
         if cached_tracks:
-            if time_ms() - cached_tracks_last_updated > cached_tracks_timeout:
+            if now_ms - cached_tracks_last_updated > cached_tracks_timeout:
                 cached_tracks = None    
 
         # Deferred selective background update with masking (after we have track bboxes)
@@ -846,7 +916,7 @@ def main():
                     new_background, mask_vis = merge_background_with_mask(background_img, raw_img, valid_tracks, padding=20)
                     
                     # Update cached_tracks (and reset `timer`) if valid_track exist
-                    cached_tracks_last_updated = time_ms()
+                    cached_tracks_last_updated = now_ms
                     cached_tracks = valid_tracks
                 elif cached_tracks:
                     # No valid tracks for the current frame, but the tracks cache is still available
@@ -861,18 +931,11 @@ def main():
 
                 # Save and upload the new background
                 background_img = new_background
-                cv2.imwrite(BACKGROUND_PATH, background_img)
+                if save_and_upload_background(background_img, frame_upload_worker, streaming_server_available):
+                    if streaming_server_available:
+                        logger.print("MAIN", "[BACKGROUND] Auto-update background queued for upload")
 
-                if streaming_server_available:
-                    try:
-                        success, jpeg_bytes = cv2.imencode('.jpg', background_img, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
-                        if success:
-                            frame_upload_worker.update_background(jpeg_bytes.tobytes())
-                            logger.print("MAIN", "[BACKGROUND] Auto-update background queued for upload")
-                    except Exception as e:
-                        logger.print("MAIN", "[BACKGROUND] Auto-update failed to queue background: %s", e)
-
-                last_update_ms = time_ms()
+                last_update_ms = now_ms
             except Exception as e:
                 logger.print("MAIN", "[BACKGROUND] Error during masked background update: %s", e)
                 mask_vis = None
@@ -903,26 +966,30 @@ def main():
         h_disp, w_disp = display_img.shape[:2]
         overlay_areas = display_img.copy()
         
+        # Pixel-space polygons are cached by the checkers until the areas or the frame size change
         areas_to_draw = []
         if debug_render_flags["show_bed_areas"]:
-            areas_to_draw.append((bed_area_checker.bed_polygons, (255, 0, 0), "Bed"))
+            areas_to_draw.append((bed_area_checker.bed_pixel_polygons(w_disp, h_disp), (255, 0, 0), "Bed"))
         if debug_render_flags["show_floor_areas"]:
-            areas_to_draw.append((floor_area_checker.floor_polygons, (0, 0, 255), "Floor"))
+            areas_to_draw.append((floor_area_checker.floor_pixel_polygons(w_disp, h_disp), (0, 0, 255), "Floor"))
         
+        area_labels = []
         for polygons, color, label in areas_to_draw:
-            if polygons:
-                for poly in polygons:
-                    if len(poly) >= 3:
-                        pts = np.array([[int(p[0] * w_disp), int(p[1] * h_disp)] for p in poly], np.int32)
-                        pts = pts.reshape((-1, 1, 2))
-                        cv2.fillPoly(overlay_areas, [pts], color)
-                        cv2.polylines(display_img, [pts], True, color, 2)
-                        # Label
-                        M = cv2.moments(pts)
-                        if M["m00"] != 0:
-                            cX = int(M["m10"] / M["m00"])
-                            cY = int(M["m01"] / M["m00"])
-                            cv2.putText(display_img, label, (cX - 20, cY), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            for pts in polygons:
+                cv2.fillPoly(overlay_areas, [pts], color)
+                cv2.polylines(display_img, [pts], True, color, 2)
+                # Label position (drawn after all polygons)
+                M = cv2.moments(pts)
+                if M["m00"] != 0:
+                    cX = int(M["m10"] / M["m00"])
+                    cY = int(M["m01"] / M["m00"])
+                    area_labels.append((cY, cX - 20, label))
+
+        # Draw labels top-to-bottom, skipping ones that would land off-screen
+        area_labels.sort()
+        for label_y, label_x, label in area_labels:
+            if 0 <= label_x < w_disp - 50 and 10 <= label_y < h_disp - 5:
+                cv2.putText(display_img, label, (label_x, label_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
 
         # Blend overlays (20% opacity)
         cv2.addWeighted(overlay_areas, 0.2, display_img, 0.8, 0, display_img)
@@ -938,61 +1005,78 @@ def main():
         key = cv2.waitKey(10) & 0xFF
         if key in [ord('q'), 27]: # q or ESC
             logger.print("MAIN", "Exit requested by user")
-            sys.modules["maix.app"].need_exit.return_value = True # Signal exit
+            app_module.set_exit_flag(True) # Signal exit
             break
         frame_profiler.end_task("display")
         
         # 12. Update FrameUploadWorker with latest RAW frame (no overlays)
-        # Privacy mode: throttle raw uploads to reduce exposure.
+        # Privacy mode: FrameUploadWorker never uploads raw frames, so don't
+        # spend time encoding them.
         frame_profiler.start_task("frame_upload")
-        try:
-            show_raw = get_flag("show_raw", False)
-            upload_interval_ms = raw_upload_interval_public_ms if show_raw else raw_upload_interval_private_ms
-            now_ms = time_ms()
 
-            if now_ms - last_raw_upload_ms >= upload_interval_ms:
-                success, jpeg_bytes = cv2.imencode('.jpg', raw_img, [int(cv2.IMWRITE_JPEG_QUALITY), 60])
+        if raw_encode_future is not None and raw_encode_future.done():
+            encode_error = raw_encode_future.exception()
+            if encode_error is not None:
+                logger.print("MAIN", "[FRAME_UPLOAD] JPEG encode failed: %s", encode_error)
+            else:
+                success, jpeg_bytes = raw_encode_future.result()
                 if success:
-                    frame_upload_worker.update_frame(jpeg_bytes.tobytes())
-                    last_raw_upload_ms = now_ms
-        except Exception:
-            pass
+                    last_raw_jpeg = memoryview(jpeg_bytes).cast("B")
+                    last_raw_signature = pending_raw_signature
+                    frame_upload_worker.update_frame(last_raw_jpeg)
+                else:
+                    logger.print("MAIN", "[FRAME_UPLOAD] JPEG encode returned no data")
+            raw_encode_future = None
+
+        if raw_encode_future is None and show_raw and now_ms - last_raw_upload_ms >= raw_upload_interval_ms:
+            thumbnail = cv2.resize(raw_img, (FRAME_SIGNATURE_SIZE, FRAME_SIGNATURE_SIZE), interpolation=cv2.INTER_AREA)
+            signature = frame_signature(thumbnail.tobytes())
+            if (last_raw_jpeg is not None and signature == last_raw_signature
+                    and now_ms - last_raw_encode_ms < RAW_JPEG_CACHE_MS):
+                # Scene unchanged: re-send the cached JPEG instead of encoding again
+                frame_upload_worker.update_frame(last_raw_jpeg)
+            else:
+                # Copy so the next capture can't overwrite the frame mid-encode
+                if (raw_encode_input is None or raw_encode_input.shape != raw_img.shape
+                        or raw_encode_input.dtype != raw_img.dtype):
+                    raw_encode_input = raw_img.copy()
+                else:
+                    np.copyto(raw_encode_input, raw_img)
+                raw_encode_future = raw_encode_executor.submit(encode_jpeg, raw_encode_input, raw_jpeg_quality)
+                pending_raw_signature = signature
+                last_raw_encode_ms = now_ms
+            last_raw_upload_ms = now_ms
         frame_profiler.end_task("frame_upload")
         
+        collect_garbage_if_needed(time_ms() - now_ms)
+
         # End frame profiling
         frame_profiler.end_frame()
         
-        # 13. Periodic GC
-        current_time = time_ms()
-        if current_time - last_gc_time > GC_INTERVAL_MS:
-            gc.collect()
-            last_gc_time = current_time
-        
         frame_counter += 1
-        if frame_counter % 30 == 0:
-            logger.print("MAIN", "Frame %d processed (FPS: %.1f)", frame_counter, current_fps)
-            if frame_counter % 60 == 0:
-                control_flags = get_control_flags()
-                logger.print("MAIN", "[STATUS] Flags: record=%s, fall_algorithm=%s",
-                          control_flags.get('record'),
-                          control_flags.get('fall_algorithm'))
+        status_logger.update_stats(frame_counter, current_fps)
 
     # ============================================
     # CLEANUP
     # ============================================
     command_receiver.stop()
     flag_sync_worker.stop()
-    state_reporter_worker.stop()
     frame_upload_worker.stop()
     ping_worker.stop()
+    status_logger.stop()
     tracks_sender.stop()
+    raw_encode_executor.shutdown(wait=False)
     
     if is_recording:
         recorder.end()
         skeleton_saver_2d.save_to_csv()
+    skeleton_saver_2d.flush(timeout=2.0)
     
     from control_manager import save_control_flags
     save_control_flags()
+
+    # Let pending writes (background, control flags, skeleton CSV) reach the disk
+    flush_writes(timeout=2.0)
     
     # Cleanup OpenCV
     cam.cap.release()
@@ -3,8 +3,8 @@
 import config
 config.configure_env("/root/.env")
 
-from maix import app, image, time
-from debug_config import DebugLogger
+from maix import app, image
+from debug_config import DebugLogger, PERF_ENABLED
 from tools.wifi_connect import connect_wifi
 from tools.video_record import VideoRecorder
 from tools.skeleton_saver import SkeletonSaver2D
@@ -14,21 +14,26 @@ from tools.chair_area_checker import ChairAreaChecker
 from tools.couch_area_checker import CouchAreaChecker
 from tools.bench_area_checker import BenchAreaChecker
 from tools.safety_judgment import SafetyJudgment
+from tools.file_writer import write_file_async, flush_writes
 
 # Import modular components
 from config import (
     initialize_camera, save_camera_info, STREAMING_HTTP_URL,
     BACKGROUND_PATH, MIN_HUMAN_FRAMES_TO_START,
     MAX_VIDEO_DURATION_MS, MAX_VIDEO_DURATION_SECONDS, UPDATE_INTERVAL_MS, NO_HUMAN_CONFIRM_FRAMES,
-    GC_INTERVAL_MS, NO_HUMAN_SECONDS_TO_STOP,
+    NO_HUMAN_SECONDS_TO_STOP, POSE_RECHECK_EVERY_N_FRAMES,
+    RAW_JPEG_CACHE_MS, FRAME_SIGNATURE_SIZE, TIME_OVERLAY_REFRESH_MS,
+    GC_GEN0_THRESHOLD, GC_OLDER_THRESHOLD, GC_FRAME_BUDGET_MS, GC_MIN_SLACK_MS, STATE_REPORT_INTERVAL_MS,
+    REGISTRATION_RETRY_MIN_S, REGISTRATION_RETRY_MAX_S,
     register_with_streaming_server
 )
+from streaming import frame_signature
 from camera_manager import (
     initialize_cameras, load_fonts,
 )
 from control_manager import (
-    load_initial_flags, get_control_flags, send_background_updated, update_control_flags_from_server,
-    update_control_flag, get_flag, camera_state_manager, register_status_change_callback,
+    load_initial_flags, get_control_flags, update_control_flags_from_server,
+    update_control_flag, camera_state_manager, register_status_change_callback,
     initialize_bed_area_checker, update_bed_area_polygons, load_bed_areas,
     initialize_floor_area_checker, update_floor_area_polygons, load_floor_areas,
     initialize_chair_area_checker, update_chair_area_polygons, load_chair_areas,
@@ -36,8 +41,9 @@ from control_manager import (
     initialize_bench_area_checker, update_bench_area_polygons, load_bench_areas
 )
 from workers import (
-    CameraStateSyncWorker, StateReporterWorker, FrameUploadWorker,
-    CommandReceiver, PingWorker, get_received_commands, handle_command,
+    CameraStateSyncWorker, FrameUploadWorker, report_current_state,
+    CommandReceiver, PingWorker, StatusLoggerWorker,
+    get_received_commands, handle_command,
     update_is_recording,
     TracksSenderWorker,
     set_tracks_worker, update_latest_tracks, mark_tracks_as_ready
@@ -45,10 +51,12 @@ from workers import (
 from tracking import (
     update_tracks, process_track, set_fps
 )
-from tools.time_utils import time_ms, TaskProfiler, get_timestamp_str
+from tools.time_utils import time_ms, TaskProfiler, get_timestamp_str, get_current_time_str
 
 import os
 import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import gc
 import time as py_time
 
@@ -174,13 +182,15 @@ SKELETON_CONNECTIONS = [
 #     return merged
 
 
-def draw_skeleton_lines(img, keypoints, color=image.COLOR_GREEN, thickness=2):
-    """Draw skeleton lines from flattened COCO keypoints [x1, y1, x2, y2, ...]."""
+def draw_skeleton_lines(img, keypoints, color=image.COLOR_GREEN, thickness=2, img_size=None):
+    """Draw skeleton lines from flattened COCO keypoints [x1, y1, x2, y2, ...].
+
+    img_size: optional (width, height) of `img`, read once per frame by the caller
+    """
     if not keypoints or len(keypoints) < 4:
         return
 
-    img_w = img.width()
-    img_h = img.height()
+    img_w, img_h = img_size if img_size is not None else (img.width(), img.height())
 
     def is_valid_point(x, y):
         """Return True only for drawable keypoints.
@@ -218,6 +228,79 @@ def draw_skeleton_lines(img, keypoints, color=image.COLOR_GREEN, thickness=2):
 
         img.draw_line(int(x1), int(y1), int(x2), int(y2), color=color, thickness=thickness)
 
+# Prerendered time overlay: redrawn only when the displayed text changes
+TIME_OVERLAY_SCALE = 0.5
+TIME_OVERLAY_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+_time_overlay_cache = {"key": None, "strip": None, "x": 0}
+
+
+def draw_time_overlay(img, time_str, img_width=None):
+    """Composite the outlined time string at the top-right corner of `img`
+
+    The 8 outline passes and the white text are drawn once into a transparent
+    RGBA strip per distinct `time_str` (and frame width, for the position);
+    each frame then costs one draw_image.
+    """
+    if img_width is None:
+        img_width = img.width()
+    if _time_overlay_cache["key"] != (time_str, img_width):
+        scale = TIME_OVERLAY_SCALE
+        size = image.string_size(time_str, scale=scale)
+        strip = image.Image(size.width() + 2, size.height() + 2, image.Format.FMT_RGBA8888,
+                            bg=image.Color.from_rgba(0, 0, 0, 0))
+        outline_color = image.Color.from_rgba(0, 0, 0, 1.0)
+        for ox, oy in TIME_OVERLAY_OFFSETS:
+            strip.draw_string(1 + ox, 1 + oy, time_str, color=outline_color, scale=scale)
+        strip.draw_string(1, 1, time_str, color=image.Color.from_rgba(255, 255, 255, 1.0), scale=scale)
+
+        # Position: top-right with some padding (strip has a 1px outline margin)
+        char_width = 8 * scale  # Approximate width per character at this scale
+        _time_overlay_cache["key"] = (time_str, img_width)
+        _time_overlay_cache["strip"] = strip
+        _time_overlay_cache["x"] = int(img_width - len(time_str) * char_width - 30) - 1
+
+    img.draw_image(_time_overlay_cache["x"], 10 - 1, _time_overlay_cache["strip"])
+
+def encode_jpeg_bytes(img, quality):
+    """JPEG-encode `img` and copy the result out of the JPEG image
+
+    The bytes go to FrameUploadWorker and may still be uploading after the
+    next encode replaces them, so they must own their memory rather than view
+    the JPEG image's buffer.
+    """
+    return img.to_jpeg(quality=quality).to_bytes()
+
+def save_and_upload_background(background_img, encode_executor, frame_upload_worker, upload, notify=False):
+    """Encode the background once on the encoder thread, then save it on the disk writer thread and optionally queue it for upload
+
+    The JPEG encode is a native call that keeps the main loop busy, so it runs
+    on `encode_executor` like the raw-frame encode. `background_img` must not
+    be modified afterwards (callers hand over a fresh copy). With `notify`, the
+    upload worker tells the server about the new background once the upload
+    has gone through.
+
+    Returns:
+        bool: True if the background was queued for encoding
+    """
+    def _encode_and_queue():
+        try:
+            jpeg_bytes = encode_jpeg_bytes(background_img, 70)
+        except Exception as e:
+            logger.print("MAIN", "[BACKGROUND] Failed to encode background: %s", e)
+            return
+
+        write_file_async(BACKGROUND_PATH, jpeg_bytes)
+        if upload:
+            frame_upload_worker.update_background(jpeg_bytes, notify=notify)
+
+    try:
+        encode_executor.submit(_encode_and_queue)
+    except RuntimeError as e:
+        # Executor already shut down
+        logger.print("MAIN", "[BACKGROUND] Failed to queue background encode: %s", e)
+        return False
+    return True
+
 # ============================================
 # RECORDING HELPER FUNCTIONS
 # ============================================
@@ -246,6 +329,24 @@ def start_new_recording(recorder, skeleton_saver, is_recording, pose_extractor):
     return is_recording, recording_start_time, frame_id
 
 
+def collect_garbage_if_needed(frame_elapsed_ms):
+    """Run the collection the interpreter would have run on its own, at a frame boundary
+
+    Automatic GC is disabled, so this is the only place cycles are collected.
+    Only the young generation is scanned unless an older one is due; a due
+    older generation is put off while the frame has used up its budget.
+    """
+    gen0, gen1, gen2 = gc.get_count()
+    if gen0 < GC_GEN0_THRESHOLD:
+        return
+    has_slack = GC_FRAME_BUDGET_MS - frame_elapsed_ms >= GC_MIN_SLACK_MS
+    if gen2 >= GC_OLDER_THRESHOLD and (has_slack or gen2 >= 2 * GC_OLDER_THRESHOLD):
+        gc.collect(2)
+    elif gen1 >= GC_OLDER_THRESHOLD and (has_slack or gen1 >= 2 * GC_OLDER_THRESHOLD):
+        gc.collect(1)
+    else:
+        gc.collect(0)
+
 def calculate_mean_fps(fps_history, default_fps=30.0):
     """Calculate mean FPS from history array."""
     if not fps_history:
@@ -266,6 +367,7 @@ def main():
     # If status is not pending/registered, keep trying registration until it becomes pending/registered.
     if registration_status not in ("pending", "registered"):
         logger.print("MAIN", "[REG] Status is '%s'. Retrying registration until pending/registered...", registration_status)
+        retry_delay = REGISTRATION_RETRY_MIN_S
         while registration_status not in ("pending", "registered"):
             CAMERA_ID, CAMERA_NAME, registration_status, local_ip = register_with_streaming_server(
                 existing_camera_id=CAMERA_ID if CAMERA_ID and CAMERA_ID != "camera_000" else None
@@ -277,9 +379,13 @@ def main():
             save_camera_info(CAMERA_ID, CAMERA_NAME, registration_status, local_ip)
 
             if registration_status not in ("pending", "registered"):
-                py_time.sleep(1)
+                # Back off (1s, 2s, 4s, ...) while the server is unreachable or refusing
+                logger.print("MAIN", "[REG] Retrying registration in %ds", retry_delay)
+                py_time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, REGISTRATION_RETRY_MAX_S)
 
     # While pending, poll registration status every second until registered.
+    # Approval is a user action on the dashboard, so this poll does not back off.
     if registration_status == "pending":
         logger.print("MAIN", "[REG] Status pending. Waiting for approval (polling every 1s)...")
         while registration_status == "pending":
@@ -288,11 +394,15 @@ def main():
                 existing_camera_id=CAMERA_ID if CAMERA_ID and CAMERA_ID != "camera_000" else None
             )
 
+            if not polled_ip or polled_ip == "unknown":
+                polled_ip = local_ip
+            polled = (polled_camera_id, polled_camera_name, polled_status, polled_ip)
+            if polled == (CAMERA_ID, CAMERA_NAME, registration_status, local_ip):
+                # Still pending with the same identity: nothing to update or store
+                continue
+
             # Keep latest identity from server response
-            CAMERA_ID, CAMERA_NAME = polled_camera_id, polled_camera_name
-            registration_status = polled_status
-            if polled_ip and polled_ip != "unknown":
-                local_ip = polled_ip
+            CAMERA_ID, CAMERA_NAME, registration_status, local_ip = polled
 
             camera_state_manager.set_camera_id(CAMERA_ID, notify=False)
             camera_state_manager.set_camera_name(CAMERA_NAME)
@@ -305,6 +415,8 @@ def main():
     # 3. Initialize cameras and detectors (RTMP removed, now returns 4 values)
     cam, disp, pose_extractor, detector = initialize_cameras()
     load_fonts()
+    # Detector class ids that count as a person (checked per detection per frame)
+    person_class_ids = frozenset(i for i, label in enumerate(detector.labels) if label in ("person", "human"))
     
     # 4. Initialize tools
     recorder = VideoRecorder()
@@ -395,6 +507,8 @@ def main():
 
     # Start command server
     command_receiver = CommandReceiver()
+    # State reports (heartbeat) go out from the command server loop
+    command_receiver.schedule(STATE_REPORT_INTERVAL_MS / 1000.0, report_current_state)
     command_receiver.start()
 
     # Start async workers
@@ -405,18 +519,18 @@ def main():
         chair_areas_queue=chair_areas_queue, couch_areas_queue=couch_areas_queue,
         bench_areas_queue=bench_areas_queue
     )
-    state_reporter_worker = StateReporterWorker(STREAMING_HTTP_URL, CAMERA_ID)
-    frame_upload_worker = FrameUploadWorker(STREAMING_HTTP_URL, CAMERA_ID, profiler_enabled=True)
+    frame_upload_worker = FrameUploadWorker(STREAMING_HTTP_URL, CAMERA_ID, profiler_enabled=PERF_ENABLED)
     ping_worker = PingWorker(STREAMING_HTTP_URL, CAMERA_ID)
+    status_logger = StatusLoggerWorker()
 
     flag_sync_worker.start()
-    state_reporter_worker.start()
     frame_upload_worker.start()
     ping_worker.start()
+    status_logger.start()
 
 
     # Start Tracks Sender Worker (always runs to send all tracks to Streaming Server)
-    tracks_sender = TracksSenderWorker(CAMERA_ID, profiler_enabled=False)
+    tracks_sender = TracksSenderWorker(CAMERA_ID, profiler_enabled=PERF_ENABLED)
     set_tracks_worker(tracks_sender)
     tracks_sender.start()
     logger.print("MAIN", "[TracksSender] Worker started")
@@ -441,7 +555,9 @@ def main():
     # STATE VARIABLES
     # ============================================
     frame_id = 0
-    human_presence_history = []
+    # Lengths of the current run of frames with / without a human present
+    human_present_streak = 0
+    no_human_streak = 0
     recording_start_time = 0
     is_recording = False
     background_update_in_progress = False
@@ -449,9 +565,8 @@ def main():
     prev_human_present = False
     no_human_counter = 0
     last_update_ms = time_ms()
-    last_gc_time = time_ms()
     streaming_server_available = True
-    frame_profiler = TaskProfiler(task_name="Main", enabled=False)
+    frame_profiler = TaskProfiler(task_name="Main", enabled=PERF_ENABLED)
     frame_profiler.register_subtasks([
         "async_updates",
         "commands",
@@ -467,8 +582,8 @@ def main():
     frame_start_time = time_ms()
     
     # FPS tracking
-    fps_history = []  # Store raw FPS values
     FPS_HISTORY_SIZE = 100  # Number of frames to average
+    fps_history = deque(maxlen=FPS_HISTORY_SIZE)  # Raw FPS values, oldest dropped on append
     mean_fps = 30.0  # Default fallback FPS
     no_human_frames_to_stop = int(NO_HUMAN_SECONDS_TO_STOP * mean_fps)  # Dynamic frames to stop based on mean FPS
     
@@ -477,9 +592,29 @@ def main():
     cached_tracks = None
     cached_tracks_timeout = 3000 # 3s
     cached_tracks_last_updated = 0
-    raw_upload_interval_public_ms = 100
-    raw_upload_interval_private_ms = 5000
+    raw_upload_interval_ms = 100
     last_raw_upload_ms = 0
+    # Overlay clock text, re-fetched every TIME_OVERLAY_REFRESH_MS
+    time_str = None
+    last_time_str_ms = 0
+
+    # Raw-frame (and background) JPEG encoding runs on a helper thread so it
+    # overlaps with the next iteration; the result is picked up (and uploaded)
+    # a frame later.
+    raw_encode_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="raw_jpeg")
+    raw_encode_future = None
+    # Encoder input, reused across encodes: the raw frame is copied into it
+    # rather than into a fresh image each time. Only written when no raw
+    # encode is in flight.
+    raw_encode_input = None
+    # Display/recording frame, reused across iterations: each frame's source
+    # is drawn into it instead of copied into a fresh image.
+    display_img = None
+    # Last encoded raw frame, reused while the scene signature is unchanged
+    last_raw_jpeg = None
+    last_raw_signature = None
+    last_raw_encode_ms = 0
+    pending_raw_signature = None
     
     # ============================================
     # MAIN LOOP
@@ -500,20 +635,32 @@ def main():
     # Upload background image to server at startup
     if streaming_server_available and background_img is not None:
         try:
-            jpeg_bytes = background_img.to_jpeg(quality=70).to_bytes(copy=False)
+            jpeg_bytes = encode_jpeg_bytes(background_img, 70)
             frame_upload_worker.update_background(jpeg_bytes)
             logger.print("MAIN", "[BACKGROUND] Background queued for upload at startup")
         except Exception as e:
             logger.print("MAIN", "[BACKGROUND] Failed to queue background for upload at startup: %s", e)
     
+    # Collect the startup garbage once, then move everything that's alive now
+    # (models, workers, background) out of the collector's view. Reference
+    # counting frees the per-frame objects; there is no periodic full collect.
+    gc.collect()
+    gc.freeze()
+    # Cyclic garbage is collected at frame boundaries only, when enough
+    # objects have been allocated to be worth a pass (collect_garbage_if_needed)
+    gc.disable()
+    
     while not app.need_exit():
         # Start frame profiling
         frame_profiler.start_frame()
+
+        # Single timestamp for every timer in this iteration
+        now_ms = time_ms()
         
         # 1. Process async updates from workers
         frame_profiler.start_task("async_updates")
         try:
-            while not flags_queue.empty():
+            while True:
                 msg_type, data = flags_queue.get_nowait()
                 if msg_type == "flags_update":
                     flags_updated = update_control_flags_from_server(data)
@@ -525,7 +672,7 @@ def main():
 
 
         try:
-            while not bed_areas_queue.empty():
+            while True:
                 msg_type, data = bed_areas_queue.get_nowait()
                 if msg_type == "bed_areas_update":
                     if isinstance(data, list):
@@ -534,7 +681,7 @@ def main():
             pass
 
         try:
-            while not chair_areas_queue.empty():
+            while True:
                 msg_type, data = chair_areas_queue.get_nowait()
                 if msg_type == "chair_areas_update":
                     if isinstance(data, list):
@@ -543,7 +690,7 @@ def main():
             pass
 
         try:
-            while not couch_areas_queue.empty():
+            while True:
                 msg_type, data = couch_areas_queue.get_nowait()
                 if msg_type == "couch_areas_update":
                     if isinstance(data, list):
@@ -552,7 +699,7 @@ def main():
             pass
 
         try:
-            while not bench_areas_queue.empty():
+            while True:
                 msg_type, data = bench_areas_queue.get_nowait()
                 if msg_type == "bench_areas_update":
                     if isinstance(data, list):
@@ -561,7 +708,7 @@ def main():
             pass
 
         try:
-            while not floor_areas_queue.empty():
+            while True:
                 msg_type, data = floor_areas_queue.get_nowait()
                 if msg_type == "floor_areas_update":
                     if isinstance(data, list):
@@ -584,27 +731,27 @@ def main():
             if cmd_data.get("command") == "approve_camera":
                 camera_state_manager.set_registration_status("registered")
         frame_profiler.end_task("commands")
+
+        # Snapshot the flags once per frame, after server and command updates
+        frame_flags = get_control_flags()
+        show_raw = frame_flags.get("show_raw", False)
+        auto_update_bg = frame_flags.get("auto_update_bg", False)
+        record_flag = frame_flags.get("record", False)
         
         # 3. Camera Read
         raw_img = cam.read()
         
         # 4. Check for background update request
         frame_profiler.start_task("background_check")
-        if get_flag("set_background", False) and not background_update_in_progress and not get_flag("_background_update_pending", False):
+        if frame_flags.get("set_background", False) and not background_update_in_progress and not frame_flags.get("_background_update_pending", False):
             logger.print("MAIN", "[BACKGROUND] Starting background update...")
             background_img = raw_img.copy()
-            background_img.save(BACKGROUND_PATH)
             background_update_in_progress = True
             update_control_flag("set_background", False)
-            # Upload background image to server via FrameUploadWorker
-            if streaming_server_available:
-                try:
-                    jpeg_bytes = background_img.to_jpeg(quality=70).to_bytes(copy=False)
-                    frame_upload_worker.update_background(jpeg_bytes)
+            # Save locally (disk writer thread) and upload via FrameUploadWorker
+            if save_and_upload_background(background_img, raw_encode_executor, frame_upload_worker, streaming_server_available, notify=True):
+                if streaming_server_available:
                     logger.print("MAIN", "[BACKGROUND] Background queued for upload to server")
-                except Exception as e:
-                    logger.print("MAIN", "[BACKGROUND] Failed to queue background for upload: %s", e)
-            send_background_updated(time.time())
             background_update_in_progress = False
             logger.print("MAIN", "[BACKGROUND] Background updated")
         frame_profiler.end_task("background_check")
@@ -612,29 +759,24 @@ def main():
         # 5. Person Detection
         frame_profiler.start_task("human detect")
         objs_det = detector.detect(raw_img, conf_th=0.5, iou_th=0.45)
-        current_human_present = any(detector.labels[obj.class_id] == "person" for obj in objs_det)
+        current_human_present = any(obj.class_id in person_class_ids for obj in objs_det)
         
         # Auto background update logic
-        if get_flag("auto_update_bg", False):
+        if auto_update_bg:
             if prev_human_present and not current_human_present:
                 no_human_counter += 1
                 if no_human_counter >= NO_HUMAN_CONFIRM_FRAMES:
                     # No humans present, can update background immediately
                     background_img = raw_img.copy()
-                    background_img.save(BACKGROUND_PATH)
-                    # Upload background image to server via FrameUploadWorker
-                    if streaming_server_available:
-                        try:
-                            jpeg_bytes = background_img.to_jpeg(quality=70).to_bytes(copy=False)
-                            frame_upload_worker.update_background(jpeg_bytes)
+                    # Save locally (disk writer thread) and upload via FrameUploadWorker
+                    if save_and_upload_background(background_img, raw_encode_executor, frame_upload_worker, streaming_server_available):
+                        if streaming_server_available:
                             logger.print("MAIN", "[BACKGROUND] Auto-update background queued for upload (no humans)")
-                        except Exception as e:
-                            logger.print("MAIN", "[BACKGROUND] Auto-update failed to queue background: %s", e)
-                    last_update_ms = time_ms()
+                    last_update_ms = now_ms
                     no_human_counter = 0
             else:
                 no_human_counter = 0
-                if time_ms() - last_update_ms > UPDATE_INTERVAL_MS:
+                if now_ms - last_update_ms > UPDATE_INTERVAL_MS:
                     # Periodic update - defer to after tracking so we can mask out humans
                     background_update_needed = True
                     logger.print("MAIN", "[BACKGROUND] Deferred background update scheduled (will mask human areas)")
@@ -643,45 +785,47 @@ def main():
         
         # 6. Prepare display image (no UI rendering)
         frame_profiler.start_task("display_prep")
-        if get_flag("show_raw", False):
-            img = raw_img.copy()
+        display_src = raw_img if show_raw or background_img is None else background_img
+        if (display_img is None or display_img.width() != display_src.width()
+                or display_img.height() != display_src.height()
+                or display_img.format() != display_src.format()):
+            display_img = display_src.copy()
         else:
-            img = background_img.copy() if background_img is not None else raw_img.copy()
+            display_img.draw_image(0, 0, display_src)
+        img = display_img
+        img_size = (img.width(), img.height())
         frame_profiler.end_task("display_prep")
         
         # 7. Pose extraction and tracking
         frame_profiler.start_task("pose_extraction")
-        objs = pose_extractor.detect(raw_img, conf_th=0.5, iou_th=0.45, keypoint_th=0.5)
+        if current_human_present or frame_counter % POSE_RECHECK_EVERY_N_FRAMES == 0:
+            objs = pose_extractor.detect(raw_img, conf_th=0.5, iou_th=0.45, keypoint_th=0.5)
+        else:
+            # Detector saw nobody - skip the pose model on this frame
+            objs = []
         pose_human_present = len(objs) > 0
         human_present = current_human_present or pose_human_present
         
-        human_presence_history.append(human_present)
-        if len(human_presence_history) > no_human_frames_to_stop + 1:
-            human_presence_history.pop(0)
+        if human_present:
+            human_present_streak += 1
+            no_human_streak = 0
+        else:
+            human_present_streak = 0
+            no_human_streak += 1
         
         # Recording logic
-        record_flag = get_flag("record", False)
-        now = time_ms()
 
         # Check if we need to start recording
         if record_flag and not is_recording:
-            if (len(human_presence_history) >= MIN_HUMAN_FRAMES_TO_START and 
-                all(human_presence_history[-MIN_HUMAN_FRAMES_TO_START:])):
+            if human_present_streak >= MIN_HUMAN_FRAMES_TO_START:
                 is_recording, recording_start_time, frame_id = start_new_recording(
                     recorder, skeleton_saver_2d, is_recording, pose_extractor
                 )
 
         # Check if we need to stop recording (due to no humans or record flag off)
         if is_recording:
-            no_human_count = 0
-            for presence in reversed(human_presence_history):
-                if not presence:
-                    no_human_count += 1
-                else:
-                    break
-            
             # Check for max video duration (1 hour) FIRST - this takes priority
-            video_duration_ms = now - recording_start_time
+            video_duration_ms = now_ms - recording_start_time
             
             if video_duration_ms >= MAX_VIDEO_DURATION_MS:
                 # Video reached 1 hour - save and restart if still recording should continue
@@ -690,13 +834,16 @@ def main():
                 is_recording, recording_start_time, frame_id = start_new_recording(
                     recorder, skeleton_saver_2d, is_recording, pose_extractor
                 )
-            elif (no_human_count >= no_human_frames_to_stop or not record_flag):
+            elif (no_human_streak >= no_human_frames_to_stop or not record_flag):
                 # Stop recording due to no humans or recording disabled
                 recorder.end()
                 skeleton_saver_2d.save_to_csv()
                 is_recording = False
                 update_is_recording(False)
                 logger.print("MAIN", "Stopped recording (no humans or record flag off)")
+                # The scene is quiet: a good time for the full collection that
+                # collect_garbage_if_needed() would otherwise run mid-activity
+                gc.collect()
 
         if is_recording:
             frame_id += 1
@@ -708,21 +855,18 @@ def main():
         tracks = update_tracks(objs)
 
         # Calculate FPS and elapsed time
-        frame_end_time = time_ms()
-        frame_duration = frame_end_time - frame_start_time
+        frame_duration = now_ms - frame_start_time
         current_fps = 1000.0 / frame_duration if frame_duration > 0 else 30.0
         
         # Store FPS in history for mean calculation
         fps_history.append(current_fps)
-        if len(fps_history) > FPS_HISTORY_SIZE:
-            fps_history.pop(0)
 
         # Calculate mean FPS
         mean_fps = calculate_mean_fps(fps_history)
         no_human_frames_to_stop = int(NO_HUMAN_SECONDS_TO_STOP * mean_fps)
         
         set_fps(current_fps)
-        frame_start_time = frame_end_time
+        frame_start_time = now_ms
 
         # Collect all processed tracks in a single list - single source of truth
         processed_tracks = []
@@ -734,36 +878,18 @@ def main():
                 skeleton_saver=skeleton_saver_2d if is_recording else None,
                 frame_id=frame_id,
                 fps=current_fps,
-                safety_judgment=safety_judgment
+                safety_judgment=safety_judgment,
+                flags=frame_flags
             )
             
             if not track_result:
                 continue
             
-            logger.print("MAIN", "pose_label <- track_result['pose_label']: %s", track_result.get('pose_label', 'unknown'))
-            track_id = track_result.get("track_id")
-            keypoints = track_result.get("keypoints")
-            bbox = track_result.get("bbox")
-            pose_label = track_result.get("pose_label", "unknown")
-            # Map "tracking" status to "normal" for safety_status
-            status = track_result.get("status", "tracking")
-            safety_status = "normal" if status == "tracking" else status
-            safety_reason = track_result.get("safety_reason", "normal")
-            safety_details = track_result.get("safety_details", {})
-            int_features = track_result.get("int_features")
-
-            # Create processed track entry with all required data
-            processed_track = {
-                "track_id": track_id,
-                "keypoints": keypoints,
-                "bbox": bbox,
-                "pose_label": pose_label,
-                "safety_status": safety_status,
-                "safety_reason": safety_reason,
-                "safety_details": safety_details,
-                "int_features": int_features
-            }
-            processed_tracks.append(processed_track)
+            if logger.enable:
+                logger.print("MAIN", "pose_label <- track_result['pose_label']: %s", track_result.get('pose_label', 'unknown'))
+            # The track result is the processed track: TracksSenderWorker builds
+            # its payload from it and reads "status" as the safety status
+            processed_tracks.append(track_result)
         
         # Send all processed tracks at once via queue (fire-and-forget)
         update_latest_tracks(processed_tracks)
@@ -772,7 +898,7 @@ def main():
         
         # Cleanup cached_tracks if timeout is hit after the last cache update
         if cached_tracks:
-            if time_ms() - cached_tracks_last_updated > cached_tracks_timeout:
+            if now_ms - cached_tracks_last_updated > cached_tracks_timeout:
                 cached_tracks = None 
 
         # Deferred background update with masking (after we have track bboxes)
@@ -806,7 +932,7 @@ def main():
 
         #         if streaming_server_available:
         #             try:
-        #                 jpeg_bytes = background_img.to_jpeg(quality=70).to_bytes(copy=False)
+        #                 jpeg_bytes = encode_jpeg_bytes(background_img, 70)
         #                 frame_upload_worker.update_background(jpeg_bytes)
         #                 logger.print("MAIN", "[BACKGROUND] Auto-update background queued for upload")
         #             except Exception as e:
@@ -827,35 +953,14 @@ def main():
             if not keypoints:
                 continue
 
-            safety_status = track.get("safety_status", "normal")
-            skeleton_color = image.COLOR_RED if safety_status == "fall" else image.COLOR_GREEN
-            draw_skeleton_lines(img, keypoints, color=skeleton_color, thickness=2)
+            skeleton_color = image.COLOR_RED if track.get("status") == "fall" else image.COLOR_GREEN
+            draw_skeleton_lines(img, keypoints, color=skeleton_color, thickness=2, img_size=img_size)
         # Draw time overlay at top-right corner
         try:
-            from tools.time_utils import get_current_time_str
-            time_str = get_current_time_str(CAMERA_ID)
-            
-            # Get image dimensions for positioning
-            img_width = img.width()
-            
-            scale = 0.5  # Adjust this for larger/smaller text
-            char_width = 8 * scale  # Approximate width per character at this scale
-            
-            text_width = len(time_str) * char_width
-            
-            # Position: top-right with some padding
-            x = int(img_width - text_width - 30)
-            y = 10
-            
-            # Draw black outline (8-direction offset)
-            outline_color = image.COLOR_BLACK
-            offsets = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-            for ox, oy in offsets:
-                img.draw_string(x + ox, y + oy, time_str, color=outline_color, scale=scale)
-            
-            # Draw white text on top
-            img.draw_string(x, y, time_str, color=image.COLOR_WHITE, scale=scale)
-            
+            if time_str is None or now_ms - last_time_str_ms >= TIME_OVERLAY_REFRESH_MS:
+                time_str = get_current_time_str(CAMERA_ID)
+                last_time_str_ms = now_ms
+            draw_time_overlay(img, time_str, img_width=img_size[0])
         except Exception as e:
             logger.print("MAIN", "[OVERLAY] Failed to draw time overlay: %s", e)
 
@@ -869,55 +974,73 @@ def main():
         frame_profiler.end_task("recording")
         
         # 12. Update FrameUploadWorker with latest RAW frame (no overlays)
-        # Privacy mode: throttle raw uploads to reduce exposure.
+        # Privacy mode: FrameUploadWorker never uploads raw frames, so don't
+        # spend time encoding them.
         frame_profiler.start_task("frame_upload")
-        try:
-            show_raw = get_flag("show_raw", False)
-            upload_interval_ms = raw_upload_interval_public_ms if show_raw else raw_upload_interval_private_ms
-            now_ms = time_ms()
+        if raw_encode_future is not None and raw_encode_future.done():
+            encode_error = raw_encode_future.exception()
+            if encode_error is not None:
+                logger.print("MAIN", "[FRAME_UPLOAD] JPEG encode failed: %s", encode_error)
+            else:
+                last_raw_jpeg = raw_encode_future.result()
+                last_raw_signature = pending_raw_signature
+                frame_upload_worker.update_frame(last_raw_jpeg)
+            raw_encode_future = None
 
-            if now_ms - last_raw_upload_ms >= upload_interval_ms:
-                jpeg_bytes = raw_img.to_jpeg(quality=60).to_bytes(copy=False)
-                frame_upload_worker.update_frame(jpeg_bytes)
+        try:
+            if raw_encode_future is None and show_raw and now_ms - last_raw_upload_ms >= raw_upload_interval_ms:
+                thumbnail = raw_img.resize(FRAME_SIGNATURE_SIZE, FRAME_SIGNATURE_SIZE)
+                signature = frame_signature(thumbnail.to_bytes(copy=False))
+                if (last_raw_jpeg is not None and signature == last_raw_signature
+                        and now_ms - last_raw_encode_ms < RAW_JPEG_CACHE_MS):
+                    # Scene unchanged - resend the cached JPEG
+                    frame_upload_worker.update_frame(last_raw_jpeg)
+                else:
+                    # Copy so the next capture can't overwrite the frame mid-encode
+                    if (raw_encode_input is None or raw_encode_input.width() != raw_img.width()
+                            or raw_encode_input.height() != raw_img.height()
+                            or raw_encode_input.format() != raw_img.format()):
+                        raw_encode_input = raw_img.copy()
+                    else:
+                        raw_encode_input.draw_image(0, 0, raw_img)
+                    raw_encode_future = raw_encode_executor.submit(encode_jpeg_bytes, raw_encode_input, 60)
+                    pending_raw_signature = signature
+                    last_raw_encode_ms = now_ms
                 last_raw_upload_ms = now_ms
-        except Exception:
-            pass
+        except Exception as e:
+            logger.print("MAIN", "[FRAME_UPLOAD] Failed to queue raw frame: %s", e)
         frame_profiler.end_task("frame_upload")
         
+        collect_garbage_if_needed(time_ms() - now_ms)
+
         # End frame profiling
         frame_profiler.end_frame()
         
-        # 13. Periodic garbage collection
-        current_time = time_ms()
-        if current_time - last_gc_time > GC_INTERVAL_MS:
-            gc.collect()
-            last_gc_time = current_time
-        
         frame_counter += 1
-        if frame_counter % 30 == 0:
-            logger.print("MAIN", "Frame %d processed, Mean FPS: %.2f", frame_counter, mean_fps)
-            if frame_counter % 60 == 0:
-                control_flags = get_control_flags()
-                logger.print("MAIN", "[STATUS] Flags: record=%s, fall_algorithm=%s",
-                          control_flags.get('record'),
-                          control_flags.get('fall_algorithm'))
+        status_logger.update_stats(frame_counter, mean_fps)
 
     # ============================================
     # CLEANUP
     # ============================================
+    # Let a pending background encode reach the disk writer before writes are flushed
+    raw_encode_executor.shutdown(wait=True)
     command_receiver.stop()
     flag_sync_worker.stop()
-    state_reporter_worker.stop()
     frame_upload_worker.stop()
     ping_worker.stop()
+    status_logger.stop()
     tracks_sender.stop()
     
     if is_recording:
         recorder.end()
         skeleton_saver_2d.save_to_csv()
+    skeleton_saver_2d.flush(timeout=2.0)
     
     from control_manager import save_control_flags
     save_control_flags()
+
+    # Let pending writes (background, control flags, skeleton CSV) reach the disk
+    flush_writes(timeout=2.0)
     
     logger.print("MAIN", "=== Camera Stream Stopped ===")
     control_flags = get_control_flags()
@@ -9,7 +9,7 @@ FALL_COUNT_THRES = 2  # how many consecutive falls required to confirm
 
 
 
-def get_fall_info(online_targets_det, online_targets, index, fallParam, queue_size, fps, pose_data=None, state=None):
+def get_fall_info(online_targets_det, online_targets, track_id, fallParam, queue_size, fps, pose_data=None, state=None):
     if state is None:
         state = {
             "counter_bbox_only": 0,
@@ -38,8 +38,10 @@ def get_fall_info(online_targets_det, online_targets, index, fallParam, queue_si
         
         return fall_detected_bbox_only, counter_bbox_only, fall_detected_motion_pose_and, counter_motion_pose_and, state
 
+    history = online_targets[track_id]
+
     # Case: no detection available
-    if online_targets["bbox"][index].empty():
+    if history.empty():
         if counter_bbox_only > 0:
             counter_bbox_only = max(0, counter_bbox_only - 1)
             counter_motion_pose_and = max(0, counter_motion_pose_and - 1)
@@ -52,8 +54,7 @@ def get_fall_info(online_targets_det, online_targets, index, fallParam, queue_si
 
     # Get current and previous bounding boxes
     cur_bbox = [online_targets_det.x, online_targets_det.y, online_targets_det.w, online_targets_det.h]
-    pre_bbox = online_targets["bbox"][index].get()
-    _ = online_targets["points"][index].get()  # keep points queue in sync with bbox
+    pre_bbox = history.pop_oldest()  # drops the matching keypoints too
 
     elapsed_ms = queue_size * 1000 / fps if fps > 0 else queue_size * 1000
 
@@ -7,6 +7,20 @@ from debug_config import DebugLogger
 
 _logger = DebugLogger(tag="INT_FEATURES", instance_enable=True)
 
+# Joints used for classification, and their COCO keypoint indices
+JOINT_NAMES = (
+    'Left Shoulder', 'Right Shoulder',
+    'Left Hip', 'Right Hip',
+    'Left Knee', 'Right Knee',
+    'Left Ankle', 'Right Ankle'
+)
+_JOINT_COCO_IDX = np.array([5, 6, 11, 12, 13, 14, 15, 16])
+
+# Limb end points as rows of the joint array, left/right interleaved:
+# thigh (hip-knee), calf (knee-ankle), torso (shoulder-hip), leg (hip-ankle)
+_LIMB_START = np.array([2, 3, 4, 5, 0, 1, 2, 3])
+_LIMB_END = np.array([4, 5, 6, 7, 2, 3, 6, 7])
+
 
 class PoseEstimation:
     """
@@ -43,7 +57,8 @@ class PoseEstimation:
     invnw = 44855536902472009823152313099539628632
 
     def __init__(self, keypoints_window_size=5, missing_value=-1, hme_enabled=True):
-        self.keypoints_map_deque = deque(maxlen=keypoints_window_size)
+        # (8, 2) joint arrays in JOINT_NAMES order, averaged over the window
+        self.joints_deque = deque(maxlen=keypoints_window_size)
         self.status = []
         self.pose_data = {}
         self.missing_value = missing_value
@@ -54,46 +69,20 @@ class PoseEstimation:
 
     def feed_keypoints_17(self, keypoints_17):
         try:
-            keypoints = np.array(keypoints_17).reshape((-1, 2))
+            keypoints = np.asarray(keypoints_17, dtype=np.float64).reshape((-1, 2))
             if keypoints.shape != (17, 2):
                 return None
         except Exception:
             return None
 
-        kp_map = {
-            'Left Shoulder': keypoints[5],
-            'Right Shoulder': keypoints[6],
-            'Left Hip': keypoints[11],
-            'Right Hip': keypoints[12],
-            'Left Knee': keypoints[13],
-            'Right Knee': keypoints[14],
-            'Left Ankle': keypoints[15],
-            'Right Ankle': keypoints[16]
-        }
-
-        return self.feed_keypoints_map(kp_map)
+        # Fancy indexing copies, so the window never aliases the caller's buffer
+        return self._feed_joints(keypoints[_JOINT_COCO_IDX])
 
     def _calculate_limb_lengths_and_ratios(self, km):
         try:
-            thigh = (
-                np.linalg.norm(km['Left Hip'] - km['Left Knee']) +
-                np.linalg.norm(km['Right Hip'] - km['Right Knee'])
-            ) / 2.0
-
-            calf = (
-                np.linalg.norm(km['Left Knee'] - km['Left Ankle']) +
-                np.linalg.norm(km['Right Knee'] - km['Right Ankle'])
-            ) / 2.0
-
-            torso = (
-                np.linalg.norm(km['Left Shoulder'] - km['Left Hip']) +
-                np.linalg.norm(km['Right Shoulder'] - km['Right Hip'])
-            ) / 2.0
-
-            leg = (
-                np.linalg.norm(km['Left Hip'] - km['Left Ankle']) +
-                np.linalg.norm(km['Right Hip'] - km['Right Ankle'])
-            ) / 2.0
+            # All eight limb lengths in one pass, then left/right averages
+            lengths = np.linalg.norm(km[_LIMB_START] - km[_LIMB_END], axis=1)
+            thigh, calf, torso, leg = (lengths[0::2] + lengths[1::2]) / 2.0
 
             thigh_calf_ratio = thigh / calf if calf > 0 else 1.0
             torso_leg_ratio = torso / leg if leg > 0 else 1.0
@@ -147,36 +136,36 @@ class PoseEstimation:
         return label, pose_code, flags
 
     def feed_keypoints_map(self, keypoints_map):
+        """Feed a {joint name: (x, y)} map containing every name in JOINT_NAMES"""
+        joints = np.array([keypoints_map[name] for name in JOINT_NAMES], dtype=np.float64)
+        return self._feed_joints(joints)
+
+    def _feed_joints(self, joints):
         # Note: Visibility check is now handled in tracking.py's should_process_track()
         # before calling pose classification. This function now only handles pose estimation.
         
-        self.keypoints_map_deque.append(keypoints_map)
+        self.joints_deque.append(joints)
 
         try:
-            km = {
-                k: sum(d[k] for d in self.keypoints_map_deque) / len(self.keypoints_map_deque)
-                for k in keypoints_map.keys()
-            }
-
-            shoulder_center = (km['Left Shoulder'] + km['Right Shoulder']) / 2.0
-            hip_center = (km['Left Hip'] + km['Right Hip']) / 2.0
-            knee_center = (km['Left Knee'] + km['Right Knee']) / 2.0
+            km = sum(self.joints_deque) / len(self.joints_deque)
 
-            torso_vec = shoulder_center - hip_center
-            thigh_vec = knee_center - hip_center
-            up_vector = np.array([0.0, -1.0])
+            # Shoulder, hip, knee and ankle centers (left/right midpoints)
+            centers = (km[0::2] + km[1::2]) / 2.0
+            torso_vec = centers[0] - centers[1]
+            thigh_vec = centers[2] - centers[1]
 
             torso_norm = np.linalg.norm(torso_vec)
             thigh_norm = np.linalg.norm(thigh_vec)
             if torso_norm == 0 or thigh_norm == 0:
                 return None
 
-            # Exact angle calculation from pose_estimation_old.py (lines 111-115)
+            # Angle to the up vector (0, -1): cos = -vec_y / |vec|
+            # (same as the dot-product form in pose_estimation_old.py)
             torso_angle = np.degrees(np.arccos(np.clip(
-                np.dot(torso_vec, up_vector) / (torso_norm * np.linalg.norm(up_vector)), -1.0, 1.0)))
+                -torso_vec[1] / torso_norm, -1.0, 1.0)))
 
             thigh_angle = np.degrees(np.arccos(np.clip(
-                np.dot(thigh_vec, up_vector) / (thigh_norm * np.linalg.norm(up_vector)), -1.0, 1.0)))
+                -thigh_vec[1] / thigh_norm, -1.0, 1.0)))
 
             thigh_uprightness = abs(thigh_angle - 180.0)
 
@@ -427,7 +416,7 @@ class PoseEstimation:
         self.hme_enabled = enabled
 
     def reset(self):
-        self.keypoints_map_deque.clear()
+        self.joints_deque.clear()
         self.status = []
         self.pose_data = {}
 
@@ -0,0 +1,53 @@
+# track_history.py
+
+import numpy as np
+
+
+class TrackHistory:
+    """Fixed-size FIFO of (bbox, keypoints) samples for one track
+
+    Samples live in preallocated ndarrays indexed by a head pointer, so
+    adding and removing them never allocates. Only used from the main loop.
+    """
+
+    def __init__(self, size, num_points):
+        self.size = size
+        self.bbox = np.empty((size, 4), dtype=np.float32)
+        self.points = np.empty((size, num_points), dtype=np.float32)
+        self.head = 0   # slot of the oldest sample
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def empty(self):
+        return self.count == 0
+
+    def full(self):
+        return self.count == self.size
+
+    def put(self, bbox, points):
+        """Append a sample, dropping the oldest one if the history is full
+
+        Args:
+            bbox: [x, y, w, h]
+            points: Flat keypoints [x1, y1, x2, y2, ...] (num_points values)
+        """
+        if self.count == self.size:
+            self.head = (self.head + 1) % self.size
+            self.count -= 1
+        slot = (self.head + self.count) % self.size
+        self.bbox[slot] = bbox
+        self.points[slot] = points
+        self.count += 1
+
+    def pop_oldest(self):
+        """Remove the oldest sample and return its bbox as [x, y, w, h]"""
+        bbox = self.bbox[self.head].tolist()
+        self.head = (self.head + 1) % self.size
+        self.count -= 1
+        return bbox
+
+    def latest_points(self):
+        """Keypoints of the newest sample (a view, valid until the next put)"""
+        return self.points[(self.head + self.count - 1) % self.size]
@@ -1,9 +1,11 @@
 # streaming.py - Streaming server communication (frame upload and generic streaming server helpers)
 
-import requests
+from tools.http_client import session as http_session, post_bytes, raw_post_bytes
+from tools.json_codec import dumps_bytes as json_dumps_bytes
 import time
 import threading
-from config import STREAMING_HTTP_URL
+import zlib
+from config import STREAMING_HTTP_URL, RAW_SOCKET_UPLOADS
 from debug_config import DebugLogger
 
 # Module-level debug logger instance
@@ -11,19 +13,62 @@ logger = DebugLogger(tag="STREAMING", instance_enable=False)
 int_features_logger = DebugLogger(tag="INT_FEATURES", instance_enable=False)
 
 
-def _fire_and_forget_post(endpoint, json_data=None, data=None, params=None, headers=None, timeout=2.0, tag="API_REQUEST", log_success=True):
-    """Generic helper to send POST requests in a background thread."""
-    def _send():
-        try:
-            url = f"{STREAMING_HTTP_URL}{endpoint}"
-            
-            req_headers = dict(headers) if headers else {}
-            
-            if json_data is not None:
-                # Set content type only if not already set
-                if 'Content-Type' not in req_headers:
-                    req_headers['Content-Type'] = 'application/json'
+# Drops the low 4 bits of every byte so sensor noise doesn't change the signature
+_SIGNATURE_QUANT = bytes(v & 0xF0 for v in range(256))
+
+
+def frame_signature(thumbnail_bytes):
+    """Cheap change signature for a frame: CRC32 of a quantized thumbnail
+
+    Args:
+        thumbnail_bytes: Raw pixel bytes of a small downscaled copy of the frame
+
+    Returns:
+        int: 32-bit signature; equal signatures mean the scene hasn't visibly changed
+    """
+    return zlib.crc32(bytes(thumbnail_bytes).translate(_SIGNATURE_QUANT))
+
+
+# Upload endpoints, built once (STREAMING_HTTP_URL is fixed after startup)
+_UPLOAD_FRAME_URL = f"{STREAMING_HTTP_URL}/api/stream/upload-frame"
+_UPLOAD_BG_URL = f"{STREAMING_HTTP_URL}/api/stream/upload-bg"
+
+# Binary uploads bypass urllib3 when enabled and the server speaks plain HTTP
+_post_upload = raw_post_bytes if RAW_SOCKET_UPLOADS and STREAMING_HTTP_URL.startswith("http://") else post_bytes
 
+
+def _as_body(data):
+    """Prepare a buffer-protocol payload for the HTTP client without copying.
+
+    Encoders hand over a memoryview of their output buffer. urllib3 passes
+    buffer objects straight to the socket and takes Content-Length from the
+    byte-formatted view; cast() is a view too, so the JPEG is never copied on
+    its way out.
+    """
+    if isinstance(data, memoryview) and data.format != "B":
+        return data.cast("B")
+    return data
+
+
+def _post(endpoint, json_data=None, data=None, params=None, headers=None, timeout=2.0, tag="API_REQUEST", log_success=True):
+    """Send a POST request on the calling thread.
+
+    Returns:
+        bool: True if the server answered 200
+    """
+    try:
+        url = f"{STREAMING_HTTP_URL}{endpoint}"
+        
+        req_headers = dict(headers) if headers else {}
+        
+        if json_data is not None:
+            # Set content type only if not already set
+            if 'Content-Type' not in req_headers:
+                req_headers['Content-Type'] = 'application/json'
+
+        # Only stringify the payload when the log line will actually be printed
+        if logger.enable:
+            if json_data is not None:
                 payload_str = str(json_data)
                 # Truncate payload string for logging if it's too long and not tracks endpoint
                 if len(payload_str) > 200 and endpoint != "/api/stream/tracks":
@@ -40,28 +85,38 @@ def _fire_and_forget_post(endpoint, json_data=None, data=None, params=None, head
             log_msg += f" | {payload_info}"
             
             logger.print(tag, log_msg)
-            
-            response = requests.post(
-                url,
-                json=json_data,
-                data=data,
-                params=params,
-                headers=req_headers if req_headers else None,
-                timeout=timeout
-            )
-            
-            if log_success:
-                if response.status_code == 200:
-                    logger.print(tag, "%s successful", endpoint)
-                else:
-                    logger.print(tag, "%s failed: HTTP %d", endpoint, response.status_code)
-                    
-        except Exception as e:
-            # For very short timeouts (< 0.5s), we expect ReadTimeout often, so ignore it silently
-            if timeout >= 0.5:
-                logger.print("STREAMING", "%s error: %s", tag, e)
+        
+        # Encode JSON ourselves (orjson when available) rather than via requests
+        body = json_dumps_bytes(json_data) if json_data is not None else _as_body(data)
+        response = http_session.post(
+            url,
+            data=body,
+            params=params,
+            headers=req_headers if req_headers else None,
+            timeout=timeout
+        )
+        
+        if log_success:
+            if response.status_code == 200:
+                logger.print(tag, "%s successful", endpoint)
+            else:
+                logger.print(tag, "%s failed: HTTP %d", endpoint, response.status_code)
+        return response.status_code == 200
                 
-    thread = threading.Thread(target=_send, daemon=True)
+    except Exception as e:
+        # For very short timeouts (< 0.5s), we expect ReadTimeout often, so ignore it silently
+        if timeout >= 0.5:
+            logger.print("STREAMING", "%s error: %s", tag, e)
+        return False
+
+
+def _fire_and_forget_post(endpoint, json_data=None, data=None, params=None, headers=None, timeout=2.0, tag="API_REQUEST", log_success=True):
+    """Generic helper to send POST requests in a background thread."""
+    thread = threading.Thread(
+        target=_post,
+        args=(endpoint, json_data, data, params, headers, timeout, tag, log_success),
+        daemon=True
+    )
     thread.start()
     return True
 
@@ -88,28 +143,24 @@ def send_frame_to_server(frame_data, camera_id):
     # Note: This function is called from FrameUploadWorker which already handles async behavior.
     # The request itself is blocking but that's acceptable since it's in a worker thread.
     try:
-        url = f"{STREAMING_HTTP_URL}/api/stream/upload-frame"
-        headers = {'X-Camera-ID': camera_id}
         logger.print("API_REQUEST", "POST | endpoint: /api/stream/upload-frame | params: camera_id=%s | payload_size: %d bytes", camera_id, len(frame_data))
-        response = requests.post(
-            url,
-            headers=headers,
-            data=frame_data,
-            timeout=2.0
-        )
-        return response.status_code == 200
+        return _post_upload(_UPLOAD_FRAME_URL, _as_body(frame_data), headers={'X-Camera-ID': camera_id}, timeout=2.0) == 200
     except Exception as e:
         logger.print("STREAMING", "Frame upload error: %s", e)
         return False
 
 
 def ping_streaming_server(camera_id):
-    """Ping streaming server to notify camera is connected (fire-and-forget)
+    """Ping streaming server to notify camera is connected
     
     Sends a ping to /api/stream/ping endpoint with camera_id as query parameter.
-    This is a non-blocking call - we don't wait for or check the response.
+    Blocks for at most the 0.5s timeout; PingWorker calls it from its own
+    thread, so no extra thread is started per ping.
+
+    Returns:
+        bool: True if the server answered with HTTP 200
     """
-    _fire_and_forget_post(
+    return _post(
         "/api/stream/ping",
         params={'camera_id': camera_id},
         timeout=0.5,
@@ -151,37 +202,43 @@ def send_keypoints_to_streaming_server(camera_id, track_id, keypoints, bbox=None
 
 
 def send_background_to_server(background_data, camera_id):
-    """Send background image to streaming server (async)
+    """Send background image to streaming server
+
+    Called from FrameUploadWorker, so the request blocks the worker thread
+    only; the result lets the worker decide whether to retry and order
+    follow-up commands.
 
     Args:
         background_data: JPEG bytes of the background image
         camera_id: Camera identifier
 
     Returns:
-        bool: True (always returns True - fire-and-forget)
+        int or None: HTTP status code, or None if no response arrived
+            (connection error or timeout)
     """
-    return _fire_and_forget_post(
-        "/api/stream/upload-bg",
-        data=background_data,
-        headers={'X-Camera-ID': camera_id},
-        timeout=5.0,
-        tag="BACKGROUND",
-        log_success=True
-    )
+    try:
+        logger.print("BACKGROUND", "POST | endpoint: /api/stream/upload-bg | payload_size: %d bytes", len(background_data))
+        status = _post_upload(_UPLOAD_BG_URL, _as_body(background_data), headers={'X-Camera-ID': camera_id}, timeout=5.0)
+        if status != 200:
+            logger.print("BACKGROUND", "/api/stream/upload-bg failed: HTTP %d", status)
+        return status
+    except Exception as e:
+        logger.print("STREAMING", "Background upload error: %s", e)
+        return None
 
 
 def send_tracks_to_streaming_server(camera_id, tracks):
-    """Send all tracks to streaming server (fire-and-forget).
+    """Send all tracks of one frame to streaming server in a single POST.
 
-    FIRE-AND-FORGET: This function sends data asynchronously with a short timeout.
-    It does NOT wait for or check the response - this achieves near 0ms interval.
+    Blocks the calling thread for up to the 1s timeout; it is called from
+    TracksSenderWorker, which skips frames while a send is in flight.
 
     Args:
         camera_id: Camera identifier
         tracks: List of track dictionaries
             
     Returns:
-        bool: True (always returns True - fire-and-forget)
+        bool: True if the server accepted the batch
     """
     data = {
         "camera_id": camera_id,
@@ -194,5 +251,5 @@ def send_tracks_to_streaming_server(camera_id, tracks):
                                   track.get("track_id"),
                                   list(track.keys()),
                                   track.get("int_features"))
-    return _fire_and_forget_post("/api/stream/tracks", json_data=data, timeout=1.0, tag="POST TRACKS", log_success=True)
+    return _post("/api/stream/tracks", json_data=data, timeout=1.0, tag="POST TRACKS", log_success=True)
 
@@ -0,0 +1,62 @@
+
+import sys
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import workers
+from workers import CommandReceiver
+
+
+@pytest.fixture
+def occupied_port(monkeypatch):
+    """A port held by another listening socket, used as LOCAL_PORT"""
+    holder = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    holder.bind(('0.0.0.0', 0))
+    holder.listen(1)
+    monkeypatch.setattr(workers, "LOCAL_PORT", holder.getsockname()[1])
+    yield holder
+    holder.close()
+
+
+def test_scheduled_jobs_run_when_port_is_taken(occupied_port):
+    fired = threading.Event()
+    receiver = CommandReceiver()
+    receiver.schedule(0.05, fired.set)
+    receiver.start()
+    try:
+        assert fired.wait(2.0)
+        assert receiver.sock is None
+
+        # Keeps firing, not just the first call
+        fired.clear()
+        assert fired.wait(2.0)
+    finally:
+        receiver.stop()
+        receiver.join(timeout=2.0)
+
+
+def test_bind_is_retried_once_port_is_free(occupied_port, monkeypatch):
+    monkeypatch.setattr(CommandReceiver, "BIND_RETRY_S", 0.1)
+    receiver = CommandReceiver()
+    receiver.start()
+    try:
+        occupied_port.close()
+        deadline = time.monotonic() + 2.0
+        while receiver.sock is None and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert receiver.sock is not None
+
+        port = workers.LOCAL_PORT
+        with socket.create_connection(("127.0.0.1", port), timeout=2.0) as conn:
+            conn.sendall(b"GET /metrics HTTP/1.1\r\n\r\n")
+            assert conn.recv(64).startswith(b"HTTP/1.1 200")
+    finally:
+        receiver.stop()
+        receiver.join(timeout=2.0)
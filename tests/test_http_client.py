@@ -0,0 +1,133 @@
+
+import sys
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tools.http_client import RawHttpConnection
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    """Records each POST; the response style is picked by the request path"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((self.client_address[1], self.path, body))
+
+        if self.path == "/slow":
+            time.sleep(0.5)
+
+        if self.path == "/garbage":
+            self.wfile.write(b"garbage\r\n\r\n")
+            self.wfile.flush()
+            return
+
+        if self.path == "/chunked":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in (b'{"status":', b'"ok"}'):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+            return
+
+        reply = b'{"status":"ok"}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(reply)))
+        if self.path == "/close":
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(reply)
+        if self.path == "/drop":
+            # Advertise keep-alive but close the socket anyway
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), UploadHandler)
+    httpd.daemon_threads = True
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_connection(server):
+    return RawHttpConnection("127.0.0.1", server.server_address[1])
+
+
+def test_keep_alive_reuses_socket(server):
+    conn = make_connection(server)
+    assert conn.post("/frame", b"first") == 200
+    assert conn.post("/frame", memoryview(b"second")) == 200
+    conn.close()
+
+    assert [body for _, _, body in server.requests] == [b"first", b"second"]
+    # Both requests arrived from the same client port
+    assert server.requests[0][0] == server.requests[1][0]
+
+
+def test_chunked_response_is_consumed(server):
+    conn = make_connection(server)
+    assert conn.post("/chunked", b"frame") == 200
+    # The next response is only parsed correctly if the chunked body was drained
+    assert conn.post("/frame", b"frame") == 200
+    conn.close()
+
+    assert server.requests[0][0] == server.requests[1][0]
+
+
+def test_connection_close_reconnects(server):
+    conn = make_connection(server)
+    assert conn.post("/close", b"first") == 200
+    assert conn._sock is None
+    assert conn.post("/frame", b"second") == 200
+    conn.close()
+
+    assert len(server.requests) == 2
+    assert server.requests[0][0] != server.requests[1][0]
+
+
+def test_server_closed_socket_is_retried_once(server):
+    conn = make_connection(server)
+    assert conn.post("/drop", b"first") == 200
+    # Let the server finish closing its end of the idle connection
+    time.sleep(0.2)
+    assert conn.post("/frame", b"second") == 200
+    conn.close()
+
+    assert [body for _, _, body in server.requests] == [b"first", b"second"]
+
+
+def test_timeout_is_not_retried(server):
+    conn = make_connection(server)
+    assert conn.post("/frame", b"first") == 200
+    with pytest.raises(socket.timeout):
+        conn.post("/slow", b"second", timeout=0.1)
+    assert conn._sock is None
+
+    # Give the server time to finish the slow request before checking
+    time.sleep(0.6)
+    assert [body for _, _, body in server.requests] == [b"first", b"second"]
+
+
+def test_malformed_status_line_closes_socket(server):
+    conn = make_connection(server)
+    with pytest.raises(ValueError):
+        conn.post("/garbage", b"first")
+    assert conn._sock is None
+    conn.close()
@@ -1,13 +1,13 @@
 
 import sys
 import os
-import queue
 from types import SimpleNamespace
 
 # Add parent directory to path to import modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from pose.judge_fall import get_fall_info
+from pose.track_history import TrackHistory
 
 # Mock classes/data
 class MockDet:
@@ -18,11 +18,7 @@ class MockDet:
         self.h = h
 
 def create_mock_targets(num_targets=2):
-    targets = {
-        "id": [i for i in range(num_targets)],
-        "bbox": [queue.Queue() for _ in range(num_targets)],
-        "points": [queue.Queue() for _ in range(num_targets)]
-    }
+    targets = {i: TrackHistory(5, 34) for i in range(num_targets)}
     return targets
 
 def test_independent_counters():
@@ -39,19 +35,17 @@ def test_independent_counters():
     
     # Simulate history for track 0 (Fall behavior)
     # Previous: y=100, h=100
-    targets["bbox"][0].put([100, 100, 50, 100])
     # Points: Full body visible (dummy values > 1)
     # 17 keypoints * 2 = 34 values
     full_body_points = [10.0] * 34 
-    targets["points"][0].put(full_body_points)
+    targets[0].put([100, 100, 50, 100], full_body_points)
     
     # Current for track 0: y=150 (moved down), h=80 (shrunk) -> FALL
     det0 = MockDet(100, 150, 50, 80)
     
     # Simulate history for track 1 (Stable behavior)
     # Previous: y=100, h=100
-    targets["bbox"][1].put([200, 100, 50, 100])
-    targets["points"][1].put(full_body_points) # Full body
+    targets[1].put([200, 100, 50, 100], full_body_points) # Full body
     
     # Current for track 1: y=100 (no move), h=100 -> NO FALL
     det1 = MockDet(200, 100, 50, 100)
@@ -82,9 +76,8 @@ def test_safeguard():
     
     # Case 1: Full Body Visible -> Should process
     print("Case 1: Full Body Visible")
-    targets["bbox"][0].put([100, 100, 50, 100])
     full_body = [10.0] * 34
-    targets["points"][0].put(full_body)
+    targets[0].put([100, 100, 50, 100], full_body)
     
     det = MockDet(100, 150, 50, 80) # Fall movement
     
@@ -103,7 +96,6 @@ def test_safeguard():
     state = None
     
     targets = create_mock_targets(1)
-    targets["bbox"][0].put([100, 100, 50, 100])
     
     # Create partial body points
     # Indices:
@@ -117,7 +109,7 @@ def test_safeguard():
     partial_body[26] = 0.0 # Right Knee X
     partial_body[27] = 0.0 # Right Knee Y
     
-    targets["points"][0].put(partial_body)
+    targets[0].put([100, 100, 50, 100], partial_body)
     
     det = MockDet(100, 150, 50, 80) # Fall movement
     
@@ -12,7 +12,7 @@ from tools.time_utils import get_current_time_str
 
 class TestTimeSync(unittest.TestCase):
     
-    @patch('tools.time_utils.requests.get')
+    @patch('tools.time_utils.http_session.get')
     def test_server_time_success(self, mock_get):
         # Mock successful server response
         mock_response = MagicMock()
@@ -26,7 +26,7 @@ class TestTimeSync(unittest.TestCase):
         print("Skipping server success test as endpoint is not ready.")
         print(f"Server Time Success: {time_str}")
 
-    @patch('tools.time_utils.requests.get')
+    @patch('tools.time_utils.http_session.get')
     def test_server_failure_fallback(self, mock_get):
         # Mock server failure (exception)
         mock_get.side_effect = Exception("Connection refused")
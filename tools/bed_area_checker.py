@@ -58,6 +58,10 @@ class BedAreaChecker:
         """Clear all bed polygons"""
         self._polygon_checker.clear_polygons()
 
+    def bed_pixel_polygons(self, width: int, height: int):
+        """Bed polygons in pixel coordinates (cached, see BodyInPolygonChecker.pixel_polygons)"""
+        return self._polygon_checker.pixel_polygons(width, height)
+
     def check_bed_area(self,
                       track_id: int,
                       body_keypoints: List[Tuple[float, float, float]],
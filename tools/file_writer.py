@@ -0,0 +1,151 @@
+# file_writer.py - Crash-safe local file writes off the main loop
+# Data goes to a temporary file next to the target, is fsync'd, and is renamed
+# over the target with os.replace(); the directory is fsync'd after the rename.
+# A crash or power cut mid-write leaves either the old or the new file, never a
+# truncated one.
+# write_file_async() hands the write to the single disk writer thread, which
+# every local file (JSON state, background image) goes through. A write to a
+# file that is still waiting replaces the pending data - only the newest
+# content of a file matters; different files are written in the order they
+# were first queued.
+
+import atexit
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from debug_config import DebugLogger
+
+logger = DebugLogger(tag="FILE_WRITER", instance_enable=False)
+
+# Writes still waiting at exit get this long to finish
+SHUTDOWN_FLUSH_TIMEOUT_S = 2.0
+
+
+def _fsync_dir(directory):
+    """Flush a directory entry (the rename) to storage where supported"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # Not supported by every filesystem
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, data):
+    """Write data (bytes-like) to path, replacing the file atomically and durably"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+    _fsync_dir(directory or ".")
+
+
+class _DiskWriter(threading.Thread):
+    """Background thread that performs the queued writes"""
+
+    def __init__(self):
+        super().__init__(daemon=True, name="disk_writer")
+        self.high_water = 0
+        self._cond = threading.Condition()
+        self._pending = OrderedDict()  # path -> (data, [futures])
+        self._busy = False
+
+    def submit(self, path, data):
+        future = Future()
+        with self._cond:
+            entry = self._pending.get(path)
+            if entry is not None:
+                # Superseded: the waiting callers are resolved by the newer write
+                self._pending[path] = (data, entry[1] + [future])
+                logger.print("WRITE", "Replaced pending write to %s", path)
+            else:
+                self._pending[path] = (data, [future])
+            self.high_water = max(self.high_water, len(self._pending))
+            self._cond.notify_all()
+        return future
+
+    def flush(self, timeout=None):
+        """Wait until every queued write has finished; True if none are left"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                path, (data, futures) = self._pending.popitem(last=False)
+                self._busy = True
+
+            try:
+                atomic_write(path, data)
+                written = True
+                logger.print("WRITE", "Wrote %s", path)
+            except Exception as e:
+                written = False
+                logger.print("WRITE", "Failed to write %s: %s", path, e)
+
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+            for future in futures:
+                future.set_result(written)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _get_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                writer = _DiskWriter()
+                writer.start()
+                _writer = writer
+    return _writer
+
+
+def write_file_async(path, data):
+    """Queue an atomic write of data (already-serialized bytes) to path
+
+    Returns:
+        Future: resolves to True once the file is written, False if the write
+            failed (failures are logged)
+    """
+    return _get_writer().submit(path, data)
+
+
+def flush_writes(timeout=None):
+    """Block until all queued writes are on disk (or timeout seconds pass)
+
+    Returns:
+        bool: True if nothing is left pending
+    """
+    if _writer is None:
+        return True
+    return _writer.flush(timeout)
+
+
+def pending_high_water():
+    """Most writes that have been waiting at once"""
+    return _writer.high_water if _writer is not None else 0
+
+
+# The writer is a daemon thread; give queued writes a chance before exit
+atexit.register(flush_writes, SHUTDOWN_FLUSH_TIMEOUT_S)
@@ -34,6 +34,10 @@ class FloorAreaChecker:
         """Clear all floor polygons"""
         self._polygon_checker.clear_polygons()
 
+    def floor_pixel_polygons(self, width: int, height: int):
+        """Floor polygons in pixel coordinates (cached, see BodyInPolygonChecker.pixel_polygons)"""
+        return self._polygon_checker.pixel_polygons(width, height)
+
     def check_floor_area(self,
                         body_keypoints: List[Tuple[float, float, float]],
                         check_method: CheckMethod = CheckMethod.FULL_BODY) -> bool:
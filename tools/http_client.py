@@ -0,0 +1,205 @@
+# http_client.py - Shared HTTP session for streaming server requests
+# One requests.Session keeps TCP connections to the streaming server alive
+# across calls instead of opening a new connection for every request.
+# The high-rate binary uploads (frames, background) skip the requests layer
+# and post through a bare urllib3 pool with post_bytes(), or, when the server
+# is a plain-HTTP host on the LAN, straight to a socket with raw_post_bytes().
+
+import socket
+import threading
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+# Pool sizes cover the worker threads that talk to the server concurrently
+# (flag sync, state reporter, frame upload, pings, tracks sender).
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 8
+
+session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+session.mount("http://", _adapter)
+session.mount("https://", _adapter)
+
+# Frame and background uploads only (FrameUploadWorker)
+pool = urllib3.PoolManager(num_pools=2, maxsize=2, retries=False)
+
+
+def post_bytes(url, body, headers=None, timeout=2.0):
+    """POST a bytes-like body through the urllib3 pool
+
+    Buffer objects (e.g. memoryview of an encoder's output) are sent as-is.
+
+    Returns:
+        int: HTTP status code
+    """
+    response = pool.request("POST", url, body=body, headers=headers,
+                            timeout=urllib3.Timeout(total=timeout), preload_content=False)
+    try:
+        return response.status
+    finally:
+        # Nothing to read from these endpoints; hand the connection back to the pool
+        response.drain_conn()
+        response.release_conn()
+
+
+class _StaleConnectionError(ConnectionError):
+    """A kept-alive socket was found closed before the server saw the request"""
+
+
+class RawHttpConnection:
+    """One persistent HTTP/1.1 keep-alive connection for binary POSTs
+
+    Writes the request head and body to the socket with a single sendmsg()
+    (no request object, no body copy) and reads back just the status line,
+    headers and Content-Length/chunked body. Plain HTTP only. Any error closes
+    the socket; the next post() reconnects.
+
+    POSTs are not idempotent, so a request is only resent when a reused socket
+    fails before any of it was sent, or is closed/reset by the server before a
+    status line arrives. Timeouts are never retried.
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self._host_header = host if port == 80 else f"{host}:{port}"
+        self._sock = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    def post(self, path, body, headers=None, timeout=2.0):
+        """POST body (bytes-like) to path; returns the HTTP status code"""
+        with self._lock:
+            # A kept-alive socket may have been closed by the server in the
+            # meantime; retry once on a fresh connection in that case
+            reused = self._sock is not None
+            try:
+                return self._post(path, body, headers, timeout)
+            except _StaleConnectionError:
+                if not reused:
+                    raise
+            return self._post(path, body, headers, timeout)
+
+    def _post(self, path, body, headers, timeout):
+        if self._sock is None:
+            sock = socket.create_connection((self.host, self.port), timeout=timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._sock = sock
+            self._reader = sock.makefile("rb")
+        self._sock.settimeout(timeout)
+
+        body = memoryview(body).cast("B")
+        lines = [f"POST {path} HTTP/1.1", f"Host: {self._host_header}",
+                 f"Content-Length: {body.nbytes}", "Connection: keep-alive"]
+        if headers:
+            lines.extend(f"{name}: {value}" for name, value in headers.items())
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        try:
+            try:
+                sent = self._sock.sendmsg([head, body])
+            except (BrokenPipeError, ConnectionResetError) as e:
+                # Nothing of this request was sent
+                raise _StaleConnectionError(str(e)) from e
+            if sent < len(head):
+                self._sock.sendall(memoryview(head)[sent:])
+                sent = len(head)
+            if sent - len(head) < body.nbytes:
+                self._sock.sendall(body[sent - len(head):])
+            return self._read_response()
+        except (OSError, ValueError):
+            self.close()
+            raise
+
+    def _read_response(self):
+        reader = self._reader
+        try:
+            status_line = reader.readline(1024)
+        except ConnectionResetError as e:
+            raise _StaleConnectionError(str(e)) from e
+        if not status_line:
+            raise _StaleConnectionError("connection closed by server")
+        parts = status_line.split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith(b"HTTP/"):
+            raise ValueError("malformed status line: %r" % status_line[:64])
+        status = int(parts[1])
+
+        length = None
+        chunked = False
+        keep_alive = True
+        while True:
+            line = reader.readline(8192)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            value = value.strip().lower()
+            if name == b"content-length":
+                length = int(value)
+            elif name == b"transfer-encoding":
+                chunked = b"chunked" in value
+            elif name == b"connection":
+                keep_alive = value != b"close"
+
+        if chunked:
+            while True:
+                size = int(reader.readline(1024).split(b";", 1)[0], 16)
+                reader.read(size + 2)  # chunk data and its CRLF
+                if size == 0:
+                    break
+        elif length is not None:
+            reader.read(length)
+        else:
+            # Body runs until the server closes the connection
+            keep_alive = False
+
+        if not keep_alive:
+            self.close()
+        return status
+
+
+_raw_connections = {}
+# url -> (connection, request path), so each upload URL is parsed once
+_raw_targets = {}
+_raw_connections_lock = threading.Lock()
+
+
+def _raw_target(url):
+    parts = urlsplit(url)
+    if parts.scheme != "http":
+        raise ValueError(f"raw_post_bytes only supports http:// URLs, got {url}")
+    key = (parts.hostname, parts.port or 80)
+    connection = _raw_connections.get(key)
+    if connection is None:
+        connection = _raw_connections[key] = RawHttpConnection(*key)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    return connection, path
+
+
+def raw_post_bytes(url, body, headers=None, timeout=2.0):
+    """POST a bytes-like body to a plain-HTTP url over a kept-alive raw socket
+
+    Returns:
+        int: HTTP status code
+    """
+    target = _raw_targets.get(url)
+    if target is None:
+        with _raw_connections_lock:
+            target = _raw_targets[url] = _raw_target(url)
+    connection, path = target
+    return connection.post(path, body, headers=headers, timeout=timeout)
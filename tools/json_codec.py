@@ -0,0 +1,38 @@
+# json_codec.py - JSON encode/decode for the network paths and local state files
+# Uses orjson when it is installed (C implementation, works on bytes directly)
+# and falls back to the standard library otherwise.
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    def dumps_bytes(obj):
+        """Serialize `obj` to UTF-8 JSON bytes"""
+        return orjson.dumps(obj)
+
+    def dumps_indent_bytes(obj):
+        """Serialize `obj` to UTF-8 JSON bytes, indented by 2 (local files)"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def loads(data):
+        """Parse JSON from bytes, bytearray, memoryview or str"""
+        return orjson.loads(data)
+else:
+    def dumps_bytes(obj):
+        """Serialize `obj` to UTF-8 JSON bytes"""
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def dumps_indent_bytes(obj):
+        """Serialize `obj` to UTF-8 JSON bytes, indented by 2 (local files)"""
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+    def loads(data):
+        """Parse JSON from bytes, bytearray, memoryview or str"""
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
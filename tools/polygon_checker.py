@@ -1,6 +1,8 @@
 from enum import Enum
 from typing import List, Tuple
 
+import numpy as np
+
 class CheckMethod(Enum):
     HIP = 1
     TORSO = 2
@@ -28,10 +30,45 @@ class COCOKeypoints:
     LEFT_ANKLE = 15
     RIGHT_ANKLE = 16
 
-class Point:
-    def __init__(self, x: float, y: float):
-        self.x = x
-        self.y = y
+def _polygon_edges(polygon) -> Tuple[np.ndarray, ...]:
+    """
+    Per-edge ray casting constants of a closed polygon
+
+    Returns (x1, y1, dx, dy, y_min, y_max, x_max, vertical), one entry per edge,
+    so points_in_polygon only has to evaluate the point-dependent terms.
+    """
+    start = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+    end = np.roll(start, -1, axis=0)
+    x1, y1 = start[:, 0], start[:, 1]
+    x2, y2 = end[:, 0], end[:, 1]
+    return (x1, y1, x2 - x1, y2 - y1,
+            np.minimum(y1, y2), np.maximum(y1, y2), np.maximum(x1, x2), x1 == x2)
+
+
+def points_in_polygon(points: np.ndarray, edges) -> np.ndarray:
+    """
+    Ray casting for many points at once
+
+    A point counts as inside when a ray cast towards +x crosses an odd number
+    of edges.
+
+    Args:
+        points: (N, 2) array of (x, y)
+        edges: Edge constants from _polygon_edges()
+
+    Returns:
+        (N,) bool array, True where the point is inside the polygon
+    """
+    x1, y1, dx, dy, y_min, y_max, x_max, vertical = edges
+    x = points[:, 0:1]
+    y = points[:, 1:2]
+    # Horizontal edges divide by zero here, but they never pass the y test below
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_intersection = (y - y1) * dx / dy + x1
+    crosses = ((y > y_min) & (y <= y_max) & (x <= x_max) &
+               (vertical | (x <= x_intersection)))
+    return np.count_nonzero(crosses, axis=1) % 2 == 1
+
 
 class BodyInPolygonChecker:
     """
@@ -43,6 +80,8 @@ class BodyInPolygonChecker:
 
     def __init__(self):
         self._polygons = []
+        self._edges = None  # Edge arrays per polygon, built on first check
+        self._pixel_polygons = None  # ((width, height), [int32 vertex arrays])
 
     @property
     def polygons(self):
@@ -51,41 +90,43 @@ class BodyInPolygonChecker:
     @polygons.setter
     def polygons(self, polygons: List[List[Tuple[float, float]]]):
         self._polygons = polygons
+        self._edges = None
+        self._pixel_polygons = None
 
     def add_polygon(self, polygon: List[Tuple[float, float]]):
         """Add a polygon to the list"""
         self._polygons.append(polygon)
+        self._edges = None
+        self._pixel_polygons = None
 
     def clear_polygons(self):
         """Clear all polygons"""
         self._polygons.clear()
+        self._edges = None
+        self._pixel_polygons = None
 
-    def point_in_polygon(self, point: Point, polygon: List[Point]) -> bool:
-        """
-        Ray casting algorithm to check if point is inside polygon
-        """
-        num_vertices = len(polygon)
-        x, y = point.x, point.y
-        inside = False
-
-        if num_vertices == 0:
-            return False
-
-        p1 = polygon[0]
-        for i in range(1, num_vertices + 1):
-            p2 = polygon[i % num_vertices]
-
-            if y > min(p1.y, p2.y):
-                if y <= max(p1.y, p2.y):
-                    if x <= max(p1.x, p2.x):
-                        if p1.y != p2.y:  # Avoid division by zero
-                            x_intersection = (y - p1.y) * (p2.x - p1.x) / (p2.y - p1.y) + p1.x
+    def _get_edges(self):
+        """Edge arrays of every polygon, cached until the polygons change"""
+        if self._edges is None:
+            self._edges = [_polygon_edges(polygon) for polygon in self._polygons]
+        return self._edges
 
-                        if p1.x == p2.x or x <= x_intersection:
-                            inside = not inside
-            p1 = p2
+    def pixel_polygons(self, width: int, height: int) -> List[np.ndarray]:
+        """
+        Polygons with at least 3 vertices scaled to a width x height image.
 
-        return inside
+        Each entry is an int32 array of shape (N, 1, 2), ready for drawing.
+        Cached until the polygons or the image size change.
+        """
+        size = (width, height)
+        if self._pixel_polygons is None or self._pixel_polygons[0] != size:
+            scale = np.array([width, height], dtype=np.float64)
+            polygons = [
+                (np.asarray(polygon, dtype=np.float64)[:, :2] * scale).astype(np.int32).reshape(-1, 1, 2)
+                for polygon in self._polygons if len(polygon) >= 3
+            ]
+            self._pixel_polygons = (size, polygons)
+        return self._pixel_polygons[1]
 
     def body_in_polygons(self,
                          body_keypoints: List[Tuple[float, float, float]],
@@ -116,32 +157,21 @@ class BodyInPolygonChecker:
         check_indices = self._get_check_indices(check_method)
 
         # Filter to only include valid keypoints within our available points
-        points_to_check = []
-        for idx in check_indices:
-            if idx < len(valid_keypoints):
-                x, y = valid_keypoints[idx]
-                points_to_check.append(Point(x, y))
+        points_to_check = [valid_keypoints[idx] for idx in check_indices if idx < len(valid_keypoints)]
 
         if not points_to_check:
             return True  # If no points to check, assume True
 
         # Check if all points are inside any of the polygons
-        for point in points_to_check:
-            point_inside_any_polygon = False
+        points = np.array(points_to_check, dtype=np.float64)
+        inside_any = np.zeros(len(points_to_check), dtype=bool)
+        for edges in self._get_edges():
+            inside_any |= points_in_polygon(points, edges)
+            if inside_any.all():
+                return True
 
-            for polygon_coords in self._polygons:
-                # Convert polygon coordinates to Point objects
-                polygon_points = [Point(x, y) for x, y in polygon_coords]
-
-                if self.point_in_polygon(point, polygon_points):
-                    point_inside_any_polygon = True
-                    break
-
-            # If any required point is not inside any polygon, body is not in polygons
-            if not point_inside_any_polygon:
-                return False
-
-        return True
+        # Some required point is not inside any polygon
+        return False
 
     def get_containing_polygons(self,
                                 body_keypoints: List[Tuple[float, float, float]],
@@ -167,31 +197,15 @@ class BodyInPolygonChecker:
         # Get points to check
         check_indices = self._get_check_indices(check_method)
 
-        points_to_check = []
-        for idx in check_indices:
-            if idx < len(valid_keypoints):
-                x, y = valid_keypoints[idx]
-                points_to_check.append(Point(x, y))
+        points_to_check = [valid_keypoints[idx] for idx in check_indices if idx < len(valid_keypoints)]
 
         if not points_to_check:
             return []
 
         # Find polygons that contain all points
-        containing_polygon_indices = []
-
-        for poly_idx, polygon_coords in enumerate(self._polygons):
-            polygon_points = [Point(x, y) for x, y in polygon_coords]
-            all_points_inside = True
-
-            for point in points_to_check:
-                if not self.point_in_polygon(point, polygon_points):
-                    all_points_inside = False
-                    break
-
-            if all_points_inside:
-                containing_polygon_indices.append(poly_idx)
-
-        return containing_polygon_indices
+        points = np.array(points_to_check, dtype=np.float64)
+        return [poly_idx for poly_idx, edges in enumerate(self._get_edges())
+                if points_in_polygon(points, edges).all()]
 
     def _get_check_indices(self, check_method: CheckMethod) -> List[int]:
         """Get the keypoint indices to check based on the check method"""
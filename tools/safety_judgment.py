@@ -7,6 +7,16 @@ from tools.couch_area_checker import CouchAreaChecker
 from tools.bench_area_checker import BenchAreaChecker
 
 
+# check_method control flag value -> CheckMethod
+_CHECK_METHOD_MAP = {
+    1: CheckMethod.HIP,
+    2: CheckMethod.TORSO,
+    3: CheckMethod.TORSO_HEAD,
+    4: CheckMethod.TORSO_HEAD_KNEES,
+    5: CheckMethod.FULL_BODY
+}
+
+
 class SafetyReason:
     """Reason codes for safety status changes"""
     LYING_ON_FLOOR = "lying_on_floor"
@@ -59,18 +69,21 @@ class SafetyJudgment:
                        track_id: int,
                        body_keypoints: List[Tuple[float, float, float]],
                        pose_label: str,
-                       max_sleep_duration_min: int = 0) -> Tuple[bool, Optional[str], Dict]:
+                       max_sleep_duration_min: int = 0,
+                       check_method_value: Optional[int] = None) -> Tuple[bool, Optional[str], Dict]:
         """
         Evaluate safety status based on all area checkers.
 
-        Reads check_method from control_flags dynamically every call to allow
-        runtime changes via web interface.
+        Uses the check_method flag of the caller's per-frame flags snapshot when
+        given, otherwise reads it from control_flags, so runtime changes via the
+        web interface apply either way.
 
         Args:
             track_id: The track ID to evaluate
             body_keypoints: List of (x, y, confidence) coordinates for COCO keypoints
             pose_label: Pose classification label (e.g., "lying_down", "standing", etc.)
             max_sleep_duration_min: Maximum allowed sleep duration in minutes (0 = disabled)
+            check_method_value: check_method flag value (1-5) from the caller's flags snapshot
 
         Returns:
             Tuple of (is_safe, reason, details)
@@ -78,19 +91,13 @@ class SafetyJudgment:
             - reason: SafetyReason code or None if safe
             - details: Dictionary with detailed check results for debugging
         """
-        # Read check_method from control_flags dynamically
+        # Read check_method from control_flags dynamically unless the caller passed it
         try:
-            from control_manager import get_flag
-            check_method_value = get_flag("check_method", 3)
+            if check_method_value is None:
+                from control_manager import get_flag
+                check_method_value = get_flag("check_method", 3)
             # Map integer value to CheckMethod enum
-            check_method_map = {
-                1: CheckMethod.HIP,
-                2: CheckMethod.TORSO,
-                3: CheckMethod.TORSO_HEAD,
-                4: CheckMethod.TORSO_HEAD_KNEES,
-                5: CheckMethod.FULL_BODY
-            }
-            check_method = check_method_map.get(check_method_value, CheckMethod.TORSO_HEAD)
+            check_method = _CHECK_METHOD_MAP.get(check_method_value, CheckMethod.TORSO_HEAD)
         except ImportError:
             # Fallback to instance check_method if control_manager not available
             check_method = self.check_method
@@ -1,12 +1,23 @@
 import csv
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from debug_config import DebugLogger
+from tools.file_writer import write_file_async
+
+logger = DebugLogger(tag="SKELETON_SAVER", instance_enable=False)
 
 class SkeletonSaver2D:
     def __init__(self):
         self.data_buffer = []
         self.log_dir = "/root/extracted-skeleton-2d"
         self.log_filename = ""
-    
+        # One thread formats the CSVs in save order, then hands the bytes to
+        # the disk writer
+        self._csv_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="skeleton_csv")
+        self._last_save = None
+
     def start_new_log(self, log_filename):
         self.log_filename = log_filename
 
@@ -14,34 +25,62 @@ class SkeletonSaver2D:
         if not keypoints_flat:
             return
 
-        # Convert flat list to pairs
-        pairs = [(keypoints_flat[i], keypoints_flat[i+1]) for i in range(0, len(keypoints_flat), 2)]
-        num_points = len(pairs)
-        flat_coords = keypoints_flat  # already flattened
-
-        self.data_buffer.append([frame_id, person_id] + flat_coords + [fall_status])
+        # One row per call: frame_id, person_id, x0, y0, x1, y1, ..., fall_status
+        row = [frame_id, person_id]
+        row.extend(keypoints_flat)
+        row.append(fall_status)
+        self.data_buffer.append(row)
 
     def save_to_csv(self):
+        """Save buffered keypoints to CSV using video filename as base
+
+        The buffer is handed to the formatting thread and a fresh one is
+        started, so formatting never blocks the capture loop. The file itself
+        is written atomically by the disk writer (see write_file_async()).
+        """
         if not self.log_filename:
             return
-        
-        """Save buffered keypoints to CSV using video filename as base"""
+
         base_name = os.path.splitext(self.log_filename)[0]
         csv_filename = os.path.join(self.log_dir, f"{base_name}.csv")
-            
-
-        # Create directory if it doesn't exist
-        os.makedirs(self.log_dir, exist_ok=True)
 
         if not self.data_buffer:
+            # Keep creating the directory even when there is nothing to write
+            os.makedirs(self.log_dir, exist_ok=True)
             return
 
-        num_kp = (len(self.data_buffer[0]) - 3) // 2
-        header = ['frame_id', 'person_id'] + [f'{c}{i}' for i in range(num_kp) for c in ['x', 'y']] + ['fall_status']
+        rows = self.data_buffer
+        self.data_buffer = []  # Clear buffer after save
+        self._last_save = self._csv_executor.submit(self._queue_csv, csv_filename, rows)
 
-        with open(csv_filename, mode='w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(header)
-            writer.writerows(self.data_buffer)
+    def flush(self, timeout=None):
+        """Wait until every saved CSV has been queued on the disk writer
 
-        self.data_buffer = []  # Clear buffer after save
+        Call before flush_writes() at shutdown so the last CSV is included.
+
+        Returns:
+            bool: True if nothing is left to format
+        """
+        if self._last_save is None:
+            return True
+        done, _ = wait([self._last_save], timeout)
+        if not done:
+            logger.print("CSV", "Timed out waiting for skeleton CSV formatting")
+            return False
+        return True
+
+    def _queue_csv(self, csv_filename, rows):
+        try:
+            self._format_and_queue(csv_filename, rows)
+        except Exception as e:
+            logger.print("CSV", "Failed to save %s: %s", csv_filename, e)
+
+    def _format_and_queue(self, csv_filename, rows):
+        num_kp = (len(rows[0]) - 3) // 2
+        header = ['frame_id', 'person_id'] + [f'{c}{i}' for i in range(num_kp) for c in ['x', 'y']] + ['fall_status']
+
+        buffer = io.StringIO(newline='')
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        writer.writerows(rows)
+        write_file_async(csv_filename, buffer.getvalue().encode())
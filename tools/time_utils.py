@@ -1,9 +1,9 @@
 import time
-import requests
 import os
 from collections import defaultdict
 from typing import Dict, List, Optional, Set
 from config import STREAMING_HTTP_URL
+from tools.http_client import session as http_session
 
 def get_timestamp_str():
     """
@@ -30,7 +30,7 @@ def get_current_time_str(camera_id: str = None) -> str:
             camera_id = os.getenv("CAMERA_ID", "unknown")
             
         url = STREAMING_HTTP_URL + "/api/stream/current-time"
-        response = requests.get(url, params={"camera_id": camera_id}, timeout=2)
+        response = http_session.get(url, params={"camera_id": camera_id}, timeout=2)
         if response.status_code == 200:
             data = response.json()
             # Expected: { "time": "14:30", "timezone": "Asia/Jakarta" }
@@ -45,7 +45,12 @@ def get_current_time_str(camera_id: str = None) -> str:
     return f"fb: {tm.tm_hour:02d}:{tm.tm_min:02d}"
 
 def time_ms():
-    return round(time.time() * 1000)
+    """Monotonic milliseconds for intervals and durations (not wall-clock time)
+
+    Unaffected by the clock being stepped (e.g. by time sync) and computed in
+    integer math.
+    """
+    return time.monotonic_ns() // 1_000_000
 
 
 class TaskProfiler:
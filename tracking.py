@@ -1,11 +1,12 @@
 # tracking.py - Tracking utilities and fall detection helpers
 
-import queue
 import numpy as np
 from maix import tracker, image
 from pose.judge_fall import get_fall_info, FALL_COUNT_THRES
 from pose.pose_estimation import PoseEstimation
+from pose.track_history import TrackHistory
 from config import INPUT_WIDTH, INPUT_HEIGHT
+from control_manager import get_control_flags
 from debug_config import DebugLogger
 
 # Module-level debug logger instance
@@ -20,7 +21,7 @@ track_thresh = 0.4
 high_thresh = 0.6
 match_thresh = 0.8
 max_history_num = 5
-valid_class_id = [0]
+valid_class_id = frozenset((0,))  # pose model class ids tracked as people
 
 # Fall detection parameters
 fallParam = {
@@ -34,18 +35,18 @@ queue_size = 5
 # Initialize tracker
 tracker0 = tracker.ByteTracker(max_lost_buff_time, track_thresh, high_thresh, match_thresh, max_history_num)
 
-# Online targets storage
-online_targets = {
-    "id": [],
-    "bbox": [],
-    "points": []
-}
+# Online targets storage: {track_id: TrackHistory of bbox/keypoint samples}
+online_targets = {}
 
 # Fall and unsafe IDs tracking
 fall_ids = set()
 unsafe_ids = set()
 fall_states = {}  # Per-track fall detection state: {track_id: state_dict}
 
+# fall_algorithm flag -> index of its "fall detected" entry in get_fall_info()'s
+# (detected1, counter1, detected2, counter2) tuple
+FALL_DETECTED_INDEX = {1: 0, 2: 2}
+
 # FPS tracking for fall detection
 current_fps = 30.0
 
@@ -59,6 +60,14 @@ POSE_RECOVERY_CACHE_SIZE = 64
 # Frame index used for temporal matching in recovery logic
 tracking_frame_index = 0
 
+# Spatial hash used to match tracks to pose objects (cell size in pixels).
+# Rings beyond POSE_MATCH_MAX_RING fall back to a full scan.
+POSE_MATCH_CELL_PX = 32
+POSE_MATCH_MAX_RING = 3
+
+# (objs list, grid) for the current frame; rebuilt when a new objs list arrives
+_pose_obj_grid = (None, None)
+
 # Recent pose snapshots used for recovery
 # Each item: {
 #   frame_idx, bbox, bbox_bottom, pose_label, status, safety_reason,
@@ -137,7 +146,70 @@ def get_fps():
     """Get the current FPS for fall detection calculations"""
     return current_fps
 
-def yolo_objs_to_tracker_objs(objs, valid_class_id=[0]):
+def _get_pose_obj_grid(objs):
+    """Get the spatial hash of pose objects for this frame (built once per objs list)"""
+    global _pose_obj_grid
+
+    cached_objs, grid = _pose_obj_grid
+    if cached_objs is objs:
+        return grid
+
+    grid = {}
+    for obj in objs:
+        key = (int(obj.x) // POSE_MATCH_CELL_PX, int(obj.y) // POSE_MATCH_CELL_PX)
+        bucket = grid.get(key)
+        if bucket is None:
+            grid[key] = [obj]
+        else:
+            bucket.append(obj)
+    _pose_obj_grid = (objs, grid)
+    return grid
+
+
+def find_closest_obj(objs, x, y):
+    """Find the pose object whose top-left corner is closest to (x, y)
+
+    Probes the spatial hash ring by ring around (x, y) and stops as soon as no
+    unvisited ring can hold a closer object, so the result matches a full scan.
+
+    Returns:
+        The closest object, or None if objs is empty
+    """
+    grid = _get_pose_obj_grid(objs)
+    cell = POSE_MATCH_CELL_PX
+    cx, cy = int(x) // cell, int(y) // cell
+
+    best_obj = None
+    min_dist = float('inf')
+
+    for ring in range(POSE_MATCH_MAX_RING + 1):
+        # Every cell in this ring is at least (ring - 1) cells away from (x, y)
+        if best_obj is not None and ((ring - 1) * cell) ** 2 >= min_dist:
+            return best_obj
+
+        for gy in range(cy - ring, cy + ring + 1):
+            edge_row = gy == cy - ring or gy == cy + ring
+            step = 1 if edge_row else 2 * ring
+            for gx in range(cx - ring, cx + ring + 1, step):
+                for obj in grid.get((gx, gy), ()):
+                    dist = (obj.x - x)**2 + (obj.y - y)**2
+                    if dist < min_dist:
+                        min_dist = dist
+                        best_obj = obj
+
+    if best_obj is not None and (POSE_MATCH_MAX_RING * cell) ** 2 >= min_dist:
+        return best_obj
+
+    # Nothing provably closest nearby - fall back to a full scan
+    for obj in objs:
+        dist = (obj.x - x)**2 + (obj.y - y)**2
+        if dist < min_dist:
+            min_dist = dist
+            best_obj = obj
+    return best_obj
+
+
+def yolo_objs_to_tracker_objs(objs, valid_class_id=valid_class_id):
     """Convert YOLO objects to tracker objects"""
     out = []
     for obj in objs:
@@ -145,36 +217,45 @@ def yolo_objs_to_tracker_objs(objs, valid_class_id=[0]):
             out.append(tracker.Object(obj.x, obj.y, obj.w, obj.h, obj.class_id, obj.score))
     return out
 
-def to_keypoints_np(obj_points):
-    """Convert flat list [x1, y1, x2, y2, ...] to numpy array"""
-    keypoints = np.array(obj_points)
-    return keypoints.reshape(-1, 2)
+def keypoints_pairs(obj_points):
+    """Flat keypoints [x1, y1, x2, y2, ...] as a (K, 2) float32 array of pixel coordinates
 
-def flat_keypoints_to_pairs(keypoints_flat):
-    """Convert flat list [x1, y1, x2, y2, ...] to list of tuples [(x1,y1), (x2,y2), ...]"""
-    if len(keypoints_flat) % 2 != 0:
-        keypoints_flat = keypoints_flat[:len(keypoints_flat)//2*2]
-    
-    pairs = []
-    for i in range(0, len(keypoints_flat), 2):
-        if i + 1 < len(keypoints_flat):
-            pairs.append((keypoints_flat[i], keypoints_flat[i+1]))
-    return pairs
+    A trailing odd value is dropped.
+    """
+    arr = np.asarray(obj_points, dtype=np.float32)
+    return arr[:arr.size // 2 * 2].reshape(-1, 2)
+
+# Output buffer reused by normalize_pairs() (main loop only)
+_NORM_SCRATCH = np.empty((64, 3), dtype=np.float32)
+
+def normalize_pairs(pairs, img_width, img_height, out=None):
+    """(K, 3) float32 array of (x, y, confidence) in 0-1 range from keypoints_pairs() output
+
+    Keypoints with x <= 0 or y <= 0 are all-zero rows. The rows are written
+    into out (default: a module-level scratch buffer), so the returned view
+    is only valid until the next call; .copy() or .tolist() it to keep it.
+    """
+    count = pairs.shape[0]
+    if out is None:
+        out = _NORM_SCRATCH if count <= len(_NORM_SCRATCH) else np.empty((count, 3), dtype=np.float32)
+    norm = out[:count]
+
+    np.multiply(pairs, (1.0 / img_width, 1.0 / img_height), out=norm[:, :2])
+    norm[:, 2] = 1.0
+    norm[~((pairs[:, 0] > 0) & (pairs[:, 1] > 0))] = 0.0
+    return norm
 
 def normalize_keypoints(keypoints_flat, img_width, img_height):
-    """Normalize keypoints to 0-1 range for safe area checking"""
-    normalized = []
-    pairs = flat_keypoints_to_pairs(keypoints_flat)
-    
-    for x, y in pairs:
-        if x > 0 and y > 0:
-            x_norm = x / img_width
-            y_norm = y / img_height
-            normalized.append((x_norm, y_norm, 1.0))
-        else:
-            normalized.append((0.0, 0.0, 0.0))
-    
-    return normalized
+    """Normalize keypoints to 0-1 range for safe area checking
+
+    Returns:
+        list: [x, y, confidence] rows, as expected by the area checkers
+    """
+    return normalize_pairs(keypoints_pairs(keypoints_flat), img_width, img_height).tolist()
+
+# Flat x-indices of the keypoints that must all be visible on one side for a
+# track to be processed: pairs 0, 4, 10, 12 (left) and 1, 5, 11, 13 (right)
+_SIDE_KEYPOINT_X = ((0, 8, 20, 24), (2, 10, 22, 26))
 
 def should_process_track(keypoints, input_width, input_height):
     """Check if keypoints are complete enough for pose classification and fall detection.
@@ -191,39 +272,16 @@ def should_process_track(keypoints, input_width, input_height):
     if not keypoints or len(keypoints) < 28:  # Need at least 14 keypoints (x,y pairs)
         return False
     
-    def is_visible(k_idx, points):
-        """Check if a keypoint is visible (within frame bounds).
-        
-        Args:
-            k_idx: 1-based COCO keypoint index
-            points: Flat list of keypoints
-        
-        Returns:
-            bool: True if keypoint is visible (within frame bounds)
-        """
-        # k_idx is 1-based COCO index
-        # 0-based index in list is (k_idx - 1) * 2
-        idx_x = (k_idx - 1) * 2
-        idx_y = idx_x + 1
-        if idx_x >= len(points) or idx_y >= len(points):
-            return False
-        x, y = points[idx_x], points[idx_y]
-        # Check if coordinates are within frame bounds
-        return x > 0 and x <= input_width and y > 0 and y <= input_height
-    
-    # Left side: Left Eye (1), Left Shoulder (5), Left Hip (11), Left Knee (13)
-    left_visible = (is_visible(1, keypoints) and   # Left Eye
-                    is_visible(5, keypoints) and   # Left Shoulder
-                    is_visible(11, keypoints) and  # Left Hip
-                    is_visible(13, keypoints))     # Left Knee
-                    
-    # Right side: Right Eye (2), Right Shoulder (6), Right Hip (12), Right Knee (14)
-    right_visible = (is_visible(2, keypoints) and   # Right Eye
-                     is_visible(6, keypoints) and   # Right Shoulder
-                     is_visible(12, keypoints) and  # Right Hip
-                     is_visible(14, keypoints))     # Right Knee
-    
-    return left_visible or right_visible
+    # A keypoint is visible when it lies within the frame bounds
+    for side in _SIDE_KEYPOINT_X:
+        for idx_x in side:
+            x = keypoints[idx_x]
+            y = keypoints[idx_x + 1]
+            if not (0 < x <= input_width and 0 < y <= input_height):
+                break
+        else:
+            return True
+    return False
 
 def update_tracks(objs, current_time_ms=None):
     """Update tracking with new detections"""
@@ -237,10 +295,19 @@ def update_tracks(objs, current_time_ms=None):
     
     # Update tracker
     tracks = tracker0.update(out_bbox)
+
+    # Forget state of tracks the tracker has dropped (ids are never reused)
+    if online_targets or fall_ids or unsafe_ids:
+        live_ids = {track.id for track in tracks}
+        for track_id in [tid for tid in online_targets if tid not in live_ids]:
+            del online_targets[track_id]
+            fall_states.pop(track_id, None)
+        fall_ids.intersection_update(live_ids)
+        unsafe_ids.intersection_update(live_ids)
     
     return tracks
 
-def process_track(track, objs, camera_id="unknown", is_recording=False, skeleton_saver=None, frame_id=0, fps=30, safety_judgment=None):
+def process_track(track, objs, camera_id="unknown", is_recording=False, skeleton_saver=None, frame_id=0, fps=30, safety_judgment=None, flags=None):
     """Process a single track - handle fall detection and safety checking
 
     Args:
@@ -251,6 +318,7 @@ def process_track(track, objs, camera_id="unknown", is_recording=False, skeleton
         frame_id: Current frame ID
         fps: Current FPS for fall detection
         safety_judgment: SafetyJudgment instance that combines all area checkers
+        flags: Control flags snapshot for this frame (read from control_manager if None)
     """
     global online_targets, fall_ids, unsafe_ids, current_fps, fall_states, tracking_frame_index
     
@@ -272,38 +340,25 @@ def process_track(track, objs, camera_id="unknown", is_recording=False, skeleton
         
         # Find closest pose object (simple Euclidean distance of top-left corner)
         # Ideally center distance is better, but this matches original logic style
-        best_obj = None
-        min_dist = float('inf')
-        
-        for obj in objs:
-            dist = (obj.x - tracker_obj.x)**2 + (obj.y - tracker_obj.y)**2
-            if dist < min_dist:
-                min_dist = dist
-                best_obj = obj
+        best_obj = find_closest_obj(objs, tracker_obj.x, tracker_obj.y)
         
         # Always use the best match if we have one
         if best_obj:
             obj = best_obj
-            keypoints_np = to_keypoints_np(obj.points)
+            # Normalized keypoints are only needed by the safety check, computed there
+            keypoints_np = keypoints_pairs(obj.points)
             
             # Check if keypoints are complete enough for processing
             # This prevents pose classification and fall detection when keypoints are incomplete
             can_process = should_process_track(obj.points, INPUT_WIDTH, INPUT_HEIGHT)
             
             # Local tracking - add to history
-            if track.id not in online_targets["id"]:
-                online_targets["id"].append(track.id)
-                online_targets["bbox"].append(queue.Queue(maxsize=queue_size))
-                online_targets["points"].append(queue.Queue(maxsize=queue_size))
-            
-            idx = online_targets["id"].index(track.id)
-            
-            if online_targets["bbox"][idx].qsize() >= queue_size:
-                online_targets["bbox"][idx].get()
-                online_targets["points"][idx].get()
+            history = online_targets.get(track.id)
+            if history is None:
+                history = online_targets[track.id] = TrackHistory(queue_size, len(obj.points))
             
-            online_targets["bbox"][idx].put([tracker_obj.x, tracker_obj.y, tracker_obj.w, tracker_obj.h])
-            online_targets["points"][idx].put(obj.points)
+            # Drops the oldest sample once queue_size samples are held
+            history.put((tracker_obj.x, tracker_obj.y, tracker_obj.w, tracker_obj.h), obj.points)
             
             # Skip pose classification and fall detection if keypoints are incomplete
             if not can_process:
@@ -321,130 +376,95 @@ def process_track(track, objs, camera_id="unknown", is_recording=False, skeleton
                         abs(_bbox_bottom_y(current_bbox) - recovered.get("bbox_bottom", _bbox_bottom_y(current_bbox)))
                     )
                 
-                # Still return track result with default values
+                # Still return track result, from the snapshot or with default values
+                snapshot = recovered if recovered is not None else {"bbox": current_bbox}
                 track_result = {
                     "track_id": track.id,
-                    "bbox": recovered.get("bbox") if recovered is not None else current_bbox,
+                    "bbox": snapshot.get("bbox"),
                     "keypoints": obj.points,
                     "keypoints_np": keypoints_np,
-                    "pose_label": recovered.get("pose_label", "unknown") if recovered is not None else "unknown",
-                    "status": recovered.get("status", "normal") if recovered is not None else "normal",
-                    "int_features": recovered.get("int_features") if recovered is not None else None,
-                    "safety_reason": recovered.get("safety_reason", "normal") if recovered is not None else "normal",
-                    "safety_details": recovered.get("safety_details", {}) if recovered is not None else {}
+                    "pose_label": snapshot.get("pose_label", "unknown"),
+                    "status": snapshot.get("status", "normal"),
+                    "int_features": snapshot.get("int_features"),
+                    "safety_reason": snapshot.get("safety_reason", "normal"),
+                    "safety_details": snapshot.get("safety_details", {})
                 }
                 return track_result
                 
             # Get fall_algorithm flag to determine which algorithm to use
-            fall_algorithm = 1  # Default: Algorithm 1 (BBox motion only)
-            try:
-                from control_manager import get_flag
-                fall_algorithm = get_flag("fall_algorithm", 1)
-            except ImportError:
-                pass
+            # (default: Algorithm 1, BBox motion only)
+            if flags is None:
+                flags = get_control_flags()
+            fall_algorithm = flags.get("fall_algorithm", 1)
 
             # Determine status
             pose_label = "unknown"
             int_features = None
             
             # Use local fall detection
-            if online_targets["bbox"][idx].qsize() >= 2:
+            if len(history) >= 2:
                 state = fall_states.get(track.id)
-                fall_result = check_fall(tracker_obj, online_targets, idx, fps, state=state)
+                fall_result = check_fall(tracker_obj, online_targets, track.id, fps, state=state)
                 if fall_result:
                     fall_info, pose_label, int_features, updated_state = fall_result
                     fall_states[track.id] = updated_state
-                    
-                    (fall_detected_method1, counter_method1,
-                     fall_detected_method2, counter_method2) = fall_info
 
                     # Update fall_ids based on selected fall algorithm
-                    fall_detected = False
-                    if fall_algorithm == 1:
-                        fall_detected = fall_detected_method1
-                    elif fall_algorithm == 2:
-                        fall_detected = fall_detected_method2
+                    detected_index = FALL_DETECTED_INDEX.get(fall_algorithm)
+                    fall_detected = detected_index is not None and fall_info[detected_index]
 
                     if fall_detected:
                         fall_ids.add(track.id)
                         unsafe_ids.discard(track.id)
                     else:
                         # No fall detected - remove from fall_ids
-                        if track.id in fall_ids:
-                            fall_ids.discard(track.id)
+                        fall_ids.discard(track.id)
 
             # Safety checking using SafetyJudgment (only if not already marked as fall)
             if track.id not in fall_ids:
                 # Check if safety checking is enabled
-                use_safety_check = False
-                try:
-                    from control_manager import get_flag
-                    use_safety_check = get_flag("use_safety_check", False)
-                except ImportError:
-                    pass
+                use_safety_check = flags.get("use_safety_check", False)
 
                 if use_safety_check and safety_judgment is not None:
-                    # Convert keypoints to the format expected by SafetyJudgment
-                    # SafetyJudgment expects: List[Tuple[float, float, float]] (x, y, confidence)
-                    body_keypoints = []
-                    for i in range(0, len(obj.points), 2):
-                        if i + 1 < len(obj.points):
-                            x = float(obj.points[i])
-                            y = float(obj.points[i + 1])
-                            # Use a default confidence of 1.0 since pose extractor doesn't provide it
-                            body_keypoints.append((x, y, 1.0))
-
-                    # Normalize keypoints for safety check (expects 0-1 range)
-                    # Using INPUT_WIDTH and INPUT_HEIGHT from config
-                    normalized_keypoints = normalize_keypoints(obj.points, INPUT_WIDTH, INPUT_HEIGHT)
+                    # SafetyJudgment expects normalized (x, y, confidence) rows in 0-1 range
+                    normalized_keypoints = normalize_pairs(keypoints_np, INPUT_WIDTH, INPUT_HEIGHT).tolist()
 
                     # Get sleep monitoring configuration
-                    max_sleep_duration = 0
-                    bedtime = ""
-                    wakeup_time = ""
-                    current_time_str = "12:00" # Default/Fallback
-                    
-                    try:
-                        from control_manager import get_flag
-                        from tools.time_utils import get_current_time_str
-                        import os
-                        
-                        max_sleep_duration = get_flag("max_sleep_duration", 0)
-                        bedtime = get_flag("bedtime", "")
-                        wakeup_time = get_flag("wakeup_time", "")
-
-                        # Fetch current time from server (with local fallback)
-                        current_time_str = get_current_time_str(camera_id)
-                    except (ImportError, Exception):
-                        pass
+                    max_sleep_duration = flags.get("max_sleep_duration", 0)
 
                     # Use SafetyJudgment to evaluate safety
                     is_safe, safety_reason, details = safety_judgment.evaluate_safety(
                         track.id, normalized_keypoints, pose_label,
-                        max_sleep_duration_min=max_sleep_duration
+                        max_sleep_duration_min=max_sleep_duration,
+                        check_method_value=flags.get("check_method", 3)
                     )
 
                     if not is_safe:
-                        # Person is unsafe - add to unsafe_ids
-                        unsafe_ids.add(track.id)
+                        # Person is unsafe - add to unsafe_ids, logging only when they become unsafe
+                        if track.id not in unsafe_ids:
+                            unsafe_ids.add(track.id)
+                            logger.print("TRACKING", "Track %d unsafe: %s | details: %s", track.id, safety_reason, details)
                         safety_details = details
-                        logger.print("TRACKING", "Track %d unsafe: %s | details: %s", track.id, safety_reason, details)
                     else:
                         # Person is safe - remove from unsafe_ids
-                        if track.id in unsafe_ids:
-                            unsafe_ids.discard(track.id)
+                        unsafe_ids.discard(track.id)
                 else:
                     # Safety checking disabled - remove from unsafe_ids
-                    if track.id in unsafe_ids:
-                        unsafe_ids.discard(track.id)
+                    unsafe_ids.discard(track.id)
             else:
                 # Already marked as fall - ensure not in unsafe_ids (fall takes precedence)
-                if track.id in unsafe_ids:
-                    unsafe_ids.discard(track.id)
+                unsafe_ids.discard(track.id)
+
+            # Status and skeleton saver safety code (0 normal, 1 fall, 2 unsafe)
+            if track.id in fall_ids:
+                status, safety_status = "fall", 1
+            elif track.id in unsafe_ids:
+                status, safety_status = "unsafe", 2
+            else:
+                status, safety_status = "normal", 0
 
             # Save to skeleton if recording
             if is_recording and skeleton_saver:
-                safety_status = 1 if track.id in fall_ids else (2 if track.id in unsafe_ids else 0)
                 skeleton_saver.add_keypoints(frame_id, track.id, obj.points, safety_status)
             
             track_result = {
@@ -453,7 +473,7 @@ def process_track(track, objs, camera_id="unknown", is_recording=False, skeleton
                 "keypoints": obj.points,
                 "keypoints_np": keypoints_np,
                 "pose_label": pose_label,  # Return pose label for analytics/local processing
-                "status": "fall" if track.id in fall_ids else ("unsafe" if track.id in unsafe_ids else "normal"),
+                "status": status,
                 "safety_reason": safety_reason,
                 "safety_details": safety_details,
                 "int_features": int_features
@@ -477,7 +497,7 @@ def process_track(track, objs, camera_id="unknown", is_recording=False, skeleton
     
     return None
 
-def check_fall(tracker_obj, track_history, idx, fps=30, state=None):
+def check_fall(tracker_obj, track_history, track_id, fps=30, state=None):
     """Check for fall using track history
     
     Returns:
@@ -496,36 +516,35 @@ def check_fall(tracker_obj, track_history, idx, fps=30, state=None):
     int_features = None
     
     # Get keypoints from history
-    if not track_history["points"][idx].empty():
-        keypoints_flat = list(track_history["points"][idx].queue)
-        if keypoints_flat:
-            # Get the most recent keypoints
-            latest_keypoints = keypoints_flat[-1]
-            
-            # Evaluate pose using PoseEstimation
-            try:
-                # Evaluate pose with keypoints
-                pose_data = pose_estimator.evaluate_pose(np.array(latest_keypoints))
-
-                # Extract label from pose_data
-                if pose_data is not None:
-                    pose_label = pose_data.get('plain_label', 'unknown')
-                    # Get features when HME is enabled for Caregiver payload or Analytics
-                    # Since use_hme is hardcoded to True, we always get int_features
-                    int_features = pose_estimator.get_int_features()
-                    int_features_logger.print("CHECK_FALL",
-                                              "int_features retrieved from pose_estimator: %s",
-                                              int_features)
-            except ImportError:
-                # Fallback if pose_estimation not available
-                pass
+    history = track_history[track_id]
+    if not history.empty():
+        # Get the most recent keypoints
+        latest_keypoints = history.latest_points()
+        
+        # Evaluate pose using PoseEstimation
+        try:
+            # Evaluate pose with keypoints
+            pose_data = pose_estimator.evaluate_pose(latest_keypoints)
+
+            # Extract label from pose_data
+            if pose_data is not None:
+                pose_label = pose_data.get('plain_label', 'unknown')
+                # Get features when HME is enabled for Caregiver payload or Analytics
+                # Since use_hme is hardcoded to True, we always get int_features
+                int_features = pose_estimator.get_int_features()
+                int_features_logger.print("CHECK_FALL",
+                                          "int_features retrieved from pose_estimator: %s",
+                                          int_features)
+        except ImportError:
+            # Fallback if pose_estimation not available
+            pass
 
     # Call fall detection with the tracker object and pose data
     # get_fall_info returns: (fall_detected_bbox_only, counter_bbox_only, fall_detected_motion_pose_and, counter_motion_pose_and, state)
     result = get_fall_info(
         tracker_obj,
         track_history,
-        idx,
+        track_id,
         fallParam,
         queue_size,
         effective_fps,
@@ -579,11 +598,7 @@ def update_fall_counters(fall_info):
 def clear_track_history():
     """Clear all track history"""
     global online_targets, fall_ids, unsafe_ids, fall_states, recent_pose_snapshots, tracking_frame_index
-    online_targets = {
-        "id": [],
-        "bbox": [],
-        "points": []
-    }
+    online_targets = {}
     fall_ids.clear()
     unsafe_ids.clear()
     fall_states.clear()
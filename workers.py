@@ -4,8 +4,7 @@ import queue
 import time
 import requests
 import socket
-import select
-import json
+import selectors
 import threading
 from debug_config import DebugLogger
 
@@ -14,7 +13,9 @@ logger = DebugLogger(tag="WORKERS", instance_enable=False)
 int_features_logger = DebugLogger(tag="INT_FEATURES", instance_enable=True)
 from config import (
     FLAG_SYNC_INTERVAL_MS, 
-    SAFE_AREA_SYNC_INTERVAL_MS, STATE_REPORT_INTERVAL_MS,
+    SAFE_AREA_SYNC_INTERVAL_MS,
+    BACKGROUND_UPLOAD_RETRY_MIN_S, BACKGROUND_UPLOAD_RETRY_MAX_S,
+    BACKGROUND_UPLOAD_MAX_ATTEMPTS,
     LOCAL_PORT
 )
 
@@ -22,10 +23,72 @@ from control_manager import (
     get_camera_state_from_server, report_state,
     get_bed_areas_from_server, get_floor_areas_from_server,
     get_chair_areas_from_server, get_couch_areas_from_server, get_bench_areas_from_server,
-    camera_state_manager, get_flag
+    camera_state_manager, get_flag, send_background_updated
 )
-from streaming import send_frame_to_server, send_background_to_server
+from streaming import send_frame_to_server, send_background_to_server, send_tracks_to_streaming_server
 from tools.time_utils import time_ms, TaskProfiler
+from tools.json_codec import dumps_bytes as json_dumps_bytes, loads as json_loads
+from tools.file_writer import pending_high_water as disk_pending_high_water
+
+
+# ============================================
+# METRICS
+# ============================================
+
+# Upload/queue counters, served as JSON on GET /metrics by CommandReceiver
+_metrics_lock = threading.Lock()
+_metrics = {
+    "frames_sent": 0,
+    "frames_dropped": 0,          # replaced in the upload slot before being sent
+    "frame_upload_failures": 0,
+    "upload_latency_ms_sum": 0,
+    "upload_latency_ms_count": 0,
+    "upload_latency_ms_max": 0,
+    "sync_updates_dropped": 0,    # put_latest() evictions
+    "worker_errors": 0,
+}
+
+def record_metric(name, value=1):
+    """Add value to a counter in the metrics"""
+    with _metrics_lock:
+        _metrics[name] += value
+
+def record_upload_latency(latency_ms):
+    """Add one frame upload duration to the latency stats"""
+    with _metrics_lock:
+        _metrics["upload_latency_ms_sum"] += latency_ms
+        _metrics["upload_latency_ms_count"] += 1
+        if latency_ms > _metrics["upload_latency_ms_max"]:
+            _metrics["upload_latency_ms_max"] = latency_ms
+
+def record_high_water(name, value):
+    """Raise a high-water mark in the metrics if value exceeds it"""
+    with _metrics_lock:
+        if value > _metrics[name]:
+            _metrics[name] = value
+
+def get_metrics():
+    """Snapshot of the metrics counters"""
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    metrics["disk_queue_high_water"] = disk_pending_high_water()
+    return metrics
+
+def put_latest(q, item):
+    """Put item on a bounded queue, dropping the oldest entry if it is full
+
+    The sync queues carry full snapshots, so when the main loop falls behind
+    the newest one is the one to keep.
+    """
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        try:
+            q.get_nowait()
+            record_metric("sync_updates_dropped")
+        except queue.Empty:
+            pass
+        q.put_nowait(item)
 
 class CameraStateSyncWorker(threading.Thread):
     """Background thread for syncing flags and editable areas from streaming server"""
@@ -66,11 +129,7 @@ class CameraStateSyncWorker(threading.Thread):
                     # Check if we received valid flags
                     if flags and isinstance(flags, dict):
                         # Put flags in queue for main thread to consume
-                        try:
-                            self.flags_queue.put_nowait(("flags_update", flags))
-                            # print(f"[FlagSync] Flags synced from server ({len(flags)} items)")
-                        except queue.Full:
-                            pass
+                        put_latest(self.flags_queue, ("flags_update", flags))
                         
                         # Reset error count on success
                         self.connection_errors = 0
@@ -92,12 +151,9 @@ class CameraStateSyncWorker(threading.Thread):
                         bed_areas = get_bed_areas_from_server()
 
                         if bed_areas is not None and isinstance(bed_areas, list):
-                            try:
-                                self.bed_areas_queue.put_nowait(("bed_areas_update", bed_areas))
-                                logger.print("FLAG_SYNC", "Bed areas synced (%d polygons)", len(bed_areas))
-                                self.last_bed_area_sync = current_time
-                            except queue.Full:
-                                pass
+                            put_latest(self.bed_areas_queue, ("bed_areas_update", bed_areas))
+                            logger.print("FLAG_SYNC", "Bed areas synced (%d polygons)", len(bed_areas))
+                            self.last_bed_area_sync = current_time
                         else:
                             logger.print("FLAG_SYNC", "Failed to get bed areas from server")
 
@@ -107,12 +163,9 @@ class CameraStateSyncWorker(threading.Thread):
                         floor_areas = get_floor_areas_from_server()
 
                         if floor_areas is not None and isinstance(floor_areas, list):
-                            try:
-                                self.floor_areas_queue.put_nowait(("floor_areas_update", floor_areas))
-                                logger.print("FLAG_SYNC", "Floor areas synced (%d polygons)", len(floor_areas))
-                                self.last_floor_area_sync = current_time
-                            except queue.Full:
-                                pass
+                            put_latest(self.floor_areas_queue, ("floor_areas_update", floor_areas))
+                            logger.print("FLAG_SYNC", "Floor areas synced (%d polygons)", len(floor_areas))
+                            self.last_floor_area_sync = current_time
                         else:
                             logger.print("FLAG_SYNC", "Failed to get floor areas from server")
 
@@ -122,12 +175,9 @@ class CameraStateSyncWorker(threading.Thread):
                         chair_areas = get_chair_areas_from_server()
 
                         if chair_areas is not None and isinstance(chair_areas, list):
-                            try:
-                                self.chair_areas_queue.put_nowait(("chair_areas_update", chair_areas))
-                                logger.print("FLAG_SYNC", "Chair areas synced (%d polygons)", len(chair_areas))
-                                self.last_chair_area_sync = current_time
-                            except queue.Full:
-                                pass
+                            put_latest(self.chair_areas_queue, ("chair_areas_update", chair_areas))
+                            logger.print("FLAG_SYNC", "Chair areas synced (%d polygons)", len(chair_areas))
+                            self.last_chair_area_sync = current_time
                         else:
                             logger.print("FLAG_SYNC", "Failed to get chair areas from server")
 
@@ -137,12 +187,9 @@ class CameraStateSyncWorker(threading.Thread):
                         couch_areas = get_couch_areas_from_server()
 
                         if couch_areas is not None and isinstance(couch_areas, list):
-                            try:
-                                self.couch_areas_queue.put_nowait(("couch_areas_update", couch_areas))
-                                logger.print("FLAG_SYNC", "Couch areas synced (%d polygons)", len(couch_areas))
-                                self.last_couch_area_sync = current_time
-                            except queue.Full:
-                                pass
+                            put_latest(self.couch_areas_queue, ("couch_areas_update", couch_areas))
+                            logger.print("FLAG_SYNC", "Couch areas synced (%d polygons)", len(couch_areas))
+                            self.last_couch_area_sync = current_time
                         else:
                             logger.print("FLAG_SYNC", "Failed to get couch areas from server")
 
@@ -152,12 +199,9 @@ class CameraStateSyncWorker(threading.Thread):
                         bench_areas = get_bench_areas_from_server()
 
                         if bench_areas is not None and isinstance(bench_areas, list):
-                            try:
-                                self.bench_areas_queue.put_nowait(("bench_areas_update", bench_areas))
-                                logger.print("FLAG_SYNC", "Bench areas synced (%d polygons)", len(bench_areas))
-                                self.last_bench_area_sync = current_time
-                            except queue.Full:
-                                pass
+                            put_latest(self.bench_areas_queue, ("bench_areas_update", bench_areas))
+                            logger.print("FLAG_SYNC", "Bench areas synced (%d polygons)", len(bench_areas))
+                            self.last_bench_area_sync = current_time
                         else:
                             logger.print("FLAG_SYNC", "Failed to get bench areas from server")
                 
@@ -183,51 +227,23 @@ class CameraStateSyncWorker(threading.Thread):
     def stop(self):
         self.running = False
 
-class StateReporterWorker(threading.Thread):
-    """Background thread for reporting camera state to streaming server
-    
-    This worker sends periodic heartbeats and state reports to the streaming server.
-    It reports to the /api/stream/report-state endpoint (NOT the command endpoint).
-    The camera only reports state - it cannot modify control flags.
+def report_current_state():
+    """Report camera state (heartbeat) to the streaming server
+
+    Scheduled on the CommandReceiver loop every STATE_REPORT_INTERVAL_MS.
+    It reports to the /api/stream/report-state endpoint (NOT the command
+    endpoint); report_state() posts from its own thread, so this returns
+    immediately and never holds up command handling.
     """
-    
-    def __init__(self, streaming_url, camera_id, report_interval_ms=STATE_REPORT_INTERVAL_MS):
-        super().__init__(daemon=True)
-        self.streaming_url = streaming_url
-        self.camera_id = camera_id
-        self.report_interval = report_interval_ms / 1000.0  # Convert to seconds
-        self.running = True
-        self.last_report_time = 0
-        
-    def run(self):
-        while self.running:
-            try:
-                current_time = time.time()
-                
-                # Check if it's time to send a heartbeat/report
-                if current_time - self.last_report_time > self.report_interval:
-                    # Report state using the helper function
-                    success = report_state(
-                        rtmp_connected=False,
-                        is_recording=get_is_recording()
-                    )
-                    
-                    if success:
-                        logger.print("STATE_REPORT", "State reported successfully")
-                    else:
-                        logger.print("STATE_REPORT", "Failed to report state")
-                    
-                    self.last_report_time = current_time
-                
-                # Sleep for report interval
-                time.sleep(self.report_interval)
-                    
-            except Exception as e:
-                logger.print("STATE_REPORT", "Error: %s", e)
-                time.sleep(5.0)  # Sleep on error
-    
-    def stop(self):
-        self.running = False
+    success = report_state(
+        rtmp_connected=False,
+        is_recording=get_is_recording()
+    )
+
+    if success:
+        logger.print("STATE_REPORT", "State reported successfully")
+    else:
+        logger.print("STATE_REPORT", "Failed to report state")
 
 class FrameUploadWorker(threading.Thread):
     """Background thread for uploading frames to streaming server (UDP-like behavior)
@@ -240,7 +256,9 @@ class FrameUploadWorker(threading.Thread):
     - Rate limited to 100ms intervals (10 FPS max) to avoid overwhelming server
 
     This achieves UDP-like behavior where slow uploads don't pile up - old frames
-    are dropped and only the latest frame is uploaded.
+    are dropped and only the latest frame is uploaded. The frame slot holds a
+    single entry; the worker blocks on an event until it is filled rather than
+    polling it, so it only wakes when there is something to send.
 
     Always sends RAW frames (no overlays) to streaming server.
 
@@ -265,6 +283,16 @@ class FrameUploadWorker(threading.Thread):
         self._background_lock = threading.Lock()
         self._current_background = None
         self._background_timestamp = 0
+        # Whether the server should be told once the background has landed
+        self._background_notify = False
+        # Failed uploads of the current background, and when to try it again
+        # (time.monotonic(); 0 = now)
+        self._background_attempts = 0
+        self._background_retry_at = 0.0
+
+        # Set whenever a new frame or background lands in its slot so the
+        # worker can block instead of polling
+        self._pending_event = threading.Event()
 
         # Upload statistics for debugging
         self.upload_count = 0
@@ -286,11 +314,17 @@ class FrameUploadWorker(threading.Thread):
         """Update the shared frame reference (called from main thread after disp.show)
         
         Args:
-            frame_data: JPEG bytes of the latest rendered frame
+            frame_data: JPEG bytes (or a memoryview over the encoder's buffer)
+                of the latest rendered frame
         """
         with self._frame_lock:
+            if self._current_frame is not None:
+                # UDP-like behavior: the unsent frame is replaced by the newer one
+                self.skip_count += 1
+                record_metric("frames_dropped")
             self._current_frame = frame_data
             self._frame_timestamp = time.time()
+        self._pending_event.set()
     
     def get_frame(self):
         """Get the current frame for upload (thread-safe)
@@ -305,16 +339,40 @@ class FrameUploadWorker(threading.Thread):
         """Clear the current frame after successful upload"""
         with self._frame_lock:
             self._current_frame = None
+
+    def take_frame(self):
+        """Remove and return the current frame (thread-safe)
+
+        Returns:
+            The latest frame data, or None if no frame available
+        """
+        with self._frame_lock:
+            frame_data = self._current_frame
+            self._current_frame = None
+            return frame_data
+
+    def _restore_frame(self, frame_data):
+        """Put a frame back for retry unless a newer one has arrived"""
+        with self._frame_lock:
+            if self._current_frame is None:
+                self._current_frame = frame_data
             
-    def update_background(self, background_data):
+    def update_background(self, background_data, notify=False):
         """Update the shared background reference (called when background is updated)
         
         Args:
-            background_data: JPEG bytes of the background image
+            background_data: JPEG bytes (or a memoryview over the encoder's
+                buffer) of the background image
+            notify: Send the background_updated command after the upload
+                succeeds (manual background requests)
         """
         with self._background_lock:
             self._current_background = background_data
             self._background_timestamp = time.time()
+            self._background_notify = self._background_notify or notify
+            self._background_attempts = 0
+            self._background_retry_at = 0.0
+        self._pending_event.set()
         logger.print("FRAME_UPLOAD", "Background update queued for upload")
     
     def get_background(self):
@@ -326,11 +384,64 @@ class FrameUploadWorker(threading.Thread):
         with self._background_lock:
             return self._current_background
             
-    def clear_background(self):
-        """Clear the current background after successful upload"""
+    def clear_background(self, uploaded):
+        """Clear the background slot after `uploaded` went through
+
+        A background queued while the upload was running is newer than
+        `uploaded`; it stays in the slot, with its notify flag, for the next
+        iteration.
+
+        Returns:
+            tuple: (notify, timestamp) - whether to send background_updated
+                for the uploaded image, and the background's timestamp
+        """
         with self._background_lock:
+            if self._current_background is not uploaded:
+                return False, None
+            notify = self._background_notify
             self._current_background = None
-            
+            self._background_notify = False
+            self._background_attempts = 0
+            self._background_retry_at = 0.0
+            return notify, self._background_timestamp
+
+    def _retry_background(self, failed, status):
+        """Schedule another upload of `failed` after an error
+
+        Only transient failures (no response, or a 5xx) are retried, with
+        exponential backoff and at most BACKGROUND_UPLOAD_MAX_ATTEMPTS tries;
+        anything else drops the background so raw frames can go out again.
+
+        Returns:
+            bool: False if the background was dropped
+        """
+        with self._background_lock:
+            if self._current_background is not failed:
+                # Replaced during the upload; the newer one goes out next
+                return True
+            self._background_attempts += 1
+            transient = status is None or status >= 500
+            if not transient or self._background_attempts >= BACKGROUND_UPLOAD_MAX_ATTEMPTS:
+                self._current_background = None
+                self._background_notify = False
+                self._background_attempts = 0
+                self._background_retry_at = 0.0
+                return False
+            delay = min(BACKGROUND_UPLOAD_RETRY_MIN_S * 2 ** (self._background_attempts - 1),
+                        BACKGROUND_UPLOAD_RETRY_MAX_S)
+            self._background_retry_at = time.monotonic() + delay
+            return True
+
+    def _wait_pending(self):
+        """Block until a frame or background is queued, or a background retry is due"""
+        with self._background_lock:
+            waiting = self._current_background is not None
+            retry_at = self._background_retry_at
+        if waiting:
+            self._pending_event.wait(max(0.0, retry_at - time.monotonic()))
+        else:
+            self._pending_event.wait()
+
     def run(self):
         """Main worker loop - continuously try to upload latest frame
         
@@ -338,36 +449,40 @@ class FrameUploadWorker(threading.Thread):
         """
         while self.running:
             try:
-                # PRIORITY 1: Check for background upload (higher priority)
+                # Clear before checking the slots: an update that races with the
+                # checks below re-sets the event, so the wait returns at once.
+                self._pending_event.clear()
+
+                # PRIORITY 1: Check for background upload (higher priority).
+                # While a failed upload backs off, frames keep going out.
                 current_background = self.get_background()
                 
-                if current_background is not None:
-                    # Check if we're already uploading
-                    if self.uploading:
-                        # Skip regular frame upload if background is pending
-                        time.sleep(0.005)
-                        continue
-                    
+                if current_background is not None and time.monotonic() >= self._background_retry_at:
                     # Start background upload
                     self.uploading = True
                     logger.print("FRAME_UPLOAD", "Uploading background image...")
                     
                     # Upload the background
                     bg_upload_start = time_ms()
-                    success = send_background_to_server(current_background, self.camera_id)
+                    status = send_background_to_server(current_background, self.camera_id)
                     bg_upload_duration = time_ms() - bg_upload_start
                     
-                    if success:
+                    if status == 200:
                         self.background_upload_count += 1
-                        self.clear_background()
+                        notify, background_timestamp = self.clear_background(current_background)
                         logger.print("FRAME_UPLOAD", "Background uploaded successfully (%d total)", self.background_upload_count)
-                    else:
+                        if notify:
+                            # Only once the server actually has the new image
+                            send_background_updated(background_timestamp)
+                    elif self._retry_background(current_background, status):
                         logger.print("FRAME_UPLOAD", "Failed to upload background (will retry)")
-                        # Keep the background for retry on next iteration
+                    else:
+                        logger.print("FRAME_UPLOAD", "Failed to upload background (HTTP %s), dropping it", status)
                     
                     # Background upload complete
                     self.uploading = False
-                    time.sleep(0.01)  # Brief pause after background upload
+                    # Brief pause after background upload
+                    time.sleep(0.01)
                     continue
                 
                 # PRIORITY 2: Regular frame upload (respects show_raw flag)
@@ -375,31 +490,27 @@ class FrameUploadWorker(threading.Thread):
                 show_raw = get_flag("show_raw", False)
                 if not show_raw:
                     # Privacy mode: don't send raw frames to streaming server
-                    # Only keypoints are sent via TracksSenderWorker
-                    time.sleep(0.01)
-                    continue
-                
-                # Get the current frame
-                current_frame = self.get_frame()
-
-                if current_frame is None:
-                    # No frame available yet, sleep briefly
-                    time.sleep(0.01)  # 10ms
+                    # Only keypoints are sent via TracksSenderWorker. The main
+                    # loop produces no frames then; sleep until a background
+                    # (or, once show_raw is back on, a frame) arrives.
+                    self._wait_pending()
                     continue
 
                 # Check rate limiting: enforce 100ms min interval between uploads
                 current_time = time_ms()
                 time_since_last_upload = current_time - self._last_upload_time
                 if time_since_last_upload < self._min_upload_interval_ms:
-                    # Too soon to upload again, sleep and continue
-                    time.sleep(0.01)  # 10ms
+                    # Too soon to upload again, sleep until the interval has passed
+                    time.sleep((self._min_upload_interval_ms - time_since_last_upload) / 1000.0)
                     continue
 
-                # Check if we're already uploading
-                if self.uploading:
-                    # UDP-like behavior: skip this frame, will upload latest on next iteration
-                    self.skip_count += 1
-                    time.sleep(0.01)  # Brief sleep before checking again
+                # Take the latest frame out of the slot; anything the main
+                # thread writes from here on replaces it for the next upload
+                current_frame = self.take_frame()
+
+                if current_frame is None:
+                    # No frame available yet, block until one arrives
+                    self._wait_pending()
                     continue
 
                 # Start upload with profiling
@@ -417,10 +528,10 @@ class FrameUploadWorker(threading.Thread):
                 self.upload_profiler.end_task("frame_upload")
                 self.upload_profiler.end_frame()
 
+                record_upload_latency(upload_duration)
                 if success:
                     self.upload_count += 1
-                    # Clear frame after successful upload
-                    self.clear_frame()
+                    record_metric("frames_sent")
 
                     # Log periodically with upload FPS
                     if self.upload_count % 30 == 0:
@@ -430,28 +541,32 @@ class FrameUploadWorker(threading.Thread):
                                     self.upload_count, self.skip_count, avg_upload_time, upload_fps)
                 else:
                     logger.print("FRAME_UPLOAD", "Failed to upload frame")
-                    # Keep the frame for retry on next iteration
+                    record_metric("frame_upload_failures")
+                    # Keep the frame for retry unless a newer one is waiting
+                    self._restore_frame(current_frame)
 
                 # Upload complete, check for new frame
+                # (the rate-limit check above spaces uploads ~100ms apart)
                 self.uploading = False
-
-                # Rate limit: sleep to maintain ~100ms intervals
-                time.sleep(0.05)  # 50ms to give some buffer
                 
             except Exception as e:
                 logger.print("FRAME_UPLOAD", "Error: %s", e)
+                record_metric("worker_errors")
                 self.uploading = False
                 time.sleep(0.1)  # Longer sleep on error
     
     def stop(self):
         """Stop the worker"""
         self.running = False
+        # Wake the loop if it is waiting for a frame
+        self._pending_event.set()
 
 class PingWorker(threading.Thread):
     """Background thread for sending periodic pings to streaming server
 
     This worker pings the streaming server every 250ms to notify the server
-    that this camera is connected and alive. Uses fire-and-forget pattern.
+    that this camera is connected and alive. Each ping is sent from this
+    thread and its result is ignored.
 
     Pings are only sent when the camera is registered (not pending/unregistered).
     The registration status is checked dynamically using CameraStateManager.
@@ -480,7 +595,7 @@ class PingWorker(threading.Thread):
                 camera_id = camera_state_manager.get_camera_id()
                 
                 if status == "registered" and camera_id and camera_id != "camera_000":
-                    # Fire-and-forget ping - don't wait for response
+                    # Result ignored - the next ping goes out on schedule anyway
                     ping_streaming_server(camera_id)
             except Exception:
                 # Silently ignore ping errors
@@ -492,6 +607,46 @@ class PingWorker(threading.Thread):
     def stop(self):
         self.running = False
 
+class StatusLoggerWorker(threading.Thread):
+    """Background thread for periodic frame/FPS status logging
+
+    The main loop only publishes its counters via update_stats(); formatting
+    and printing happen here at a fixed low rate so the per-frame path does
+    no logging work.
+    """
+
+    def __init__(self, log_interval_ms=1000, flags_every=2):
+        super().__init__(daemon=True)
+        self.log_interval = log_interval_ms / 1000.0  # Convert to seconds
+        self.flags_every = flags_every
+        self.running = True
+
+        # Written by the main thread, read here (plain attribute stores are atomic)
+        self.frame_counter = 0
+        self.fps = 0.0
+
+    def update_stats(self, frame_counter, fps):
+        """Publish the latest frame counter and FPS (called from main thread)"""
+        self.frame_counter = frame_counter
+        self.fps = fps
+
+    def run(self):
+        from control_manager import get_control_flags
+
+        ticks = 0
+        while self.running:
+            time.sleep(self.log_interval)
+            ticks += 1
+            logger.print("STATUS", "Frame %d processed, FPS: %.2f", self.frame_counter, self.fps)
+            if ticks % self.flags_every == 0:
+                control_flags = get_control_flags()
+                logger.print("STATUS", "Flags: record=%s, fall_algorithm=%s",
+                          control_flags.get('record'),
+                          control_flags.get('fall_algorithm'))
+
+    def stop(self):
+        self.running = False
+
 # ============================================
 # COMMAND SERVER (for receiving commands from streaming server)
 # ============================================
@@ -499,116 +654,219 @@ command_server_running = True
 received_commands = []
 commands_lock = threading.Lock()
 
+# Constant HTTP response headers, encoded once
+OK_PRELUDE = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nConnection: close\r\n\r\n"
+NOT_FOUND_RESPONSE = b"HTTP/1.1 404 Not Found\r\nConnection: close\r\n\r\n"
+BAD_REQUEST_RESPONSE = b"HTTP/1.1 400 Bad Request\r\nConnection: close\r\n\r\nError"
+
 class CommandReceiver(threading.Thread):
-    """HTTP server to receive commands from streaming server"""
+    """HTTP server to receive commands from streaming server
+
+    A single thread multiplexes the listening socket and all client
+    connections with a selector (epoll on Linux) instead of spawning a
+    thread per connection. Light periodic jobs registered with schedule()
+    run from the same loop: select() sleeps until the next one is due. If
+    LOCAL_PORT can't be bound, the loop keeps running the jobs and retries
+    the bind every BIND_RETRY_S seconds.
+    """
+
+    CLIENT_TIMEOUT_S = 1.0
+    # How often to retry binding LOCAL_PORT if it is taken (e.g. by a stale instance)
+    BIND_RETRY_S = 5
+    # Commands are small JSON bodies; requests larger than this are truncated
+    REQUEST_BUFFER_SIZE = 4096
     
     def __init__(self):
         super().__init__(daemon=True)
         self.running = True
         self.sock = None
+        self._selector = None
+        self._timers = []  # [next_due, interval_s, callback]
+
+    def schedule(self, interval_s, callback):
+        """Run callback every interval_s seconds from the server loop
+
+        The first call happens as soon as the loop starts. Callbacks must not
+        block; call before start().
+        """
+        self._timers.append([0.0, interval_s, callback])
         
     def run(self):
         """Run command server"""
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._selector = selectors.DefaultSelector()
+        next_bind_attempt = 0.0
         
         try:
-            self.sock.bind(('0.0.0.0', LOCAL_PORT))
-            self.sock.listen(5)
-            self.sock.settimeout(0.5)
-            logger.print("CMD_SERVER", "Command server listening on port %d", LOCAL_PORT)
-            
             while self.running:
+                # Scheduled jobs keep running even while the port can't be bound
+                if self.sock is None and time.monotonic() >= next_bind_attempt:
+                    if not self._start_listening():
+                        next_bind_attempt = time.monotonic() + self.BIND_RETRY_S
                 try:
-                    readable, _, _ = select.select([self.sock], [], [], 0.5)
-                    if readable:
-                        conn, addr = self.sock.accept()
-                        conn.settimeout(1.0)
-                        
-                        client_thread = threading.Thread(
-                            target=self.handle_client, 
-                            args=(conn, addr),
-                            daemon=True
-                        )
-                        client_thread.start()
-                        
-                except socket.timeout:
-                    continue
+                    events = self._selector.select(timeout=self._select_timeout())
+                    for key, _ in events:
+                        if key.data is None:
+                            self._accept_client()
+                        else:
+                            self._read_client(key.fileobj, key.data)
+                    self._expire_clients()
+                    self._run_due_timers()
                 except Exception as e:
                     logger.print("CMD_SERVER", "Accept error: %s", e)
                     time.sleep(0.1)
-                    
-        except Exception as e:
-            logger.print("CMD_SERVER", "Failed to start: %s", e)
         finally:
+            for key in list(self._selector.get_map().values()):
+                if key.data is not None:
+                    self._close_client(key.fileobj)
+            self._selector.close()
             if self.sock:
                 self.sock.close()
-    
-    def handle_client(self, conn, addr):
-        """Handle client connection"""
+
+    def _start_listening(self):
+        """Bind the listening socket and register it; False if the bind failed"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
-            request = b""
-            try:
-                while True:
-                    chunk = conn.recv(1024)
-                    if not chunk:
-                        break
-                    request += chunk
-                    if b"\r\n\r\n" in request:
-                        break
-            except socket.timeout:
-                pass
-            
-            if request:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(('0.0.0.0', LOCAL_PORT))
+            sock.listen(5)
+            sock.setblocking(False)
+            self._selector.register(sock, selectors.EVENT_READ, data=None)
+        except OSError as e:
+            sock.close()
+            logger.print("CMD_SERVER", "Failed to start on port %d: %s (retrying in %ds)",
+                         LOCAL_PORT, e, self.BIND_RETRY_S)
+            return False
+        self.sock = sock
+        logger.print("CMD_SERVER", "Command server listening on port %d", LOCAL_PORT)
+        return True
+
+    def _select_timeout(self):
+        """Seconds until the next timer is due, capped for client expiry"""
+        timeout = 0.5
+        if self._timers:
+            now = time.monotonic()
+            timeout = min(timeout, max(0.0, min(t[0] for t in self._timers) - now))
+        return timeout
+
+    def _run_due_timers(self):
+        """Call the scheduled jobs whose deadline has passed"""
+        now = time.monotonic()
+        for timer in self._timers:
+            if now >= timer[0]:
+                timer[0] = now + timer[1]
                 try:
-                    request_str = request.decode('utf-8', errors='ignore')
-                    
-                    if "POST /command" in request_str:
-                        body_start = request_str.find("\r\n\r\n")
-                        if body_start != -1:
-                            body = request_str[body_start + 4:]
-                            if body:
-                                data = json.loads(body.strip())
-                                with commands_lock:
-                                    received_commands.append(data)
-                                
-                                response = "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n"
-                                response += json.dumps({"status": "success", "camera_id": camera_state_manager.get_camera_id()})
-                                conn.send(response.encode())
-                                logger.print("CMD_SERVER", "Received command from %s: %s = %s", addr[0], data.get('command'), data.get('value'))
-                    else:
-                        response = "HTTP/1.1 404 Not Found\r\n\r\n"
-                        conn.send(response.encode())
-                        
+                    timer[2]()
                 except Exception as e:
-                    logger.print("CMD_SERVER", "Command parsing error: %s", e)
-                    response = "HTTP/1.1 400 Bad Request\r\n\r\nError"
-                    conn.send(response.encode())
-            
-            conn.close()
-            
+                    logger.print("CMD_SERVER", "Scheduled job error: %s", e)
+
+    def _accept_client(self):
+        """Accept a pending connection and register it for reading"""
+        try:
+            conn, addr = self.sock.accept()
+        except BlockingIOError:
+            return
+        conn.setblocking(False)
+        buffer = bytearray(self.REQUEST_BUFFER_SIZE)
+        client = {
+            "addr": addr,
+            "buffer": buffer,
+            "view": memoryview(buffer),
+            "length": 0,
+            "deadline": time.monotonic() + self.CLIENT_TIMEOUT_S
+        }
+        self._selector.register(conn, selectors.EVENT_READ, data=client)
+
+    def _read_client(self, conn, client):
+        """Read available data; handle the request once headers are complete"""
+        length = client["length"]
+        try:
+            received = conn.recv_into(client["view"][length:])
+        except BlockingIOError:
+            return
+        except OSError as e:
+            logger.print("CMD_SERVER", "Client handling error: %s", e)
+            self._close_client(conn)
+            return
+
+        if received:
+            client["length"] = length + received
+            # Only the newly received bytes (plus 3 for a split terminator) need scanning
+            headers_done = client["buffer"].find(b"\r\n\r\n", max(0, length - 3), client["length"]) != -1
+            if not headers_done and client["length"] < self.REQUEST_BUFFER_SIZE:
+                return
+
+        # Peer closed the connection, the request headers are complete or the buffer is full
+        self._finish_client(conn, client)
+
+    def _expire_clients(self):
+        """Handle whatever clients have sent once their read timeout passes"""
+        now = time.monotonic()
+        for key in list(self._selector.get_map().values()):
+            if key.data is not None and now >= key.data["deadline"]:
+                self._finish_client(key.fileobj, key.data)
+
+    def _finish_client(self, conn, client):
+        """Stop watching the connection, respond to the request and close it"""
+        self._selector.unregister(conn)
+        try:
+            conn.settimeout(self.CLIENT_TIMEOUT_S)
+            if client["length"]:
+                self.handle_request(conn, client["addr"], client["view"][:client["length"]])
         except Exception as e:
             logger.print("CMD_SERVER", "Client handling error: %s", e)
+        finally:
             try:
                 conn.close()
-            except:
+            except OSError:
                 pass
+
+    def _close_client(self, conn):
+        """Drop a client connection without responding"""
+        try:
+            self._selector.unregister(conn)
+        except (KeyError, ValueError):
+            pass
+        try:
+            conn.close()
+        except OSError:
+            pass
+    
+    def handle_request(self, conn, addr, request):
+        """Parse a complete HTTP request (bytes-like) and send the response"""
+        try:
+            # Match the request line on the raw bytes; only the body is parsed
+            request = bytes(request)
+            
+            if request.startswith(b"POST /command"):
+                body_start = request.find(b"\r\n\r\n")
+                if body_start != -1:
+                    body = request[body_start + 4:].strip()
+                    if body:
+                        data = json_loads(body)
+                        with commands_lock:
+                            received_commands.append(data)
+                        
+                        response_body = json_dumps_bytes({"status": "success", "camera_id": camera_state_manager.get_camera_id()})
+                        conn.sendall(OK_PRELUDE + response_body)
+                        logger.print("CMD_SERVER", "Received command from %s: %s = %s", addr[0], data.get('command'), data.get('value'))
+            elif request.startswith(b"GET /metrics"):
+                conn.sendall(OK_PRELUDE + json_dumps_bytes(get_metrics()))
+            else:
+                conn.sendall(NOT_FOUND_RESPONSE)
+                
+        except Exception as e:
+            logger.print("CMD_SERVER", "Command parsing error: %s", e)
+            conn.sendall(BAD_REQUEST_RESPONSE)
     
     def stop(self):
-        """Stop the server"""
+        """Stop the server (the selector loop closes the sockets on exit)"""
         self.running = False
-        if self.sock:
-            try:
-                self.sock.close()
-            except:
-                pass
 
 def get_received_commands():
     """Get and clear received commands"""
     global received_commands
     with commands_lock:
-        commands = received_commands.copy()
-        received_commands = []
+        commands, received_commands = received_commands, []
     return commands
 
 def handle_command(command, value, camera_id, registration_status, save_camera_info_func):
@@ -715,12 +973,12 @@ def update_latest_tracks(processed_tracks):
     to signal the worker that tracks are ready to send.
 
     Args:
-        processed_tracks: List of track dictionaries, each containing:
+        processed_tracks: List of track dictionaries (process_track() results), each containing:
             - track_id: int
             - keypoints: list of 34 floats (17 keypoints × 2 coordinates)
             - bbox: list [x, y, w, h]
             - pose_label: str
-            - safety_status: str (normal, unsafe, fall)
+            - safety_status or status: str (normal, unsafe, fall)
 
     Returns:
         bool: True if data was updated successfully, False otherwise
@@ -768,10 +1026,10 @@ class TracksSenderWorker(threading.Thread):
     This worker waits for the main thread to finish processing tracks, then sends them
     to the streaming server in the background, preventing blocking of the main loop.
 
-    Uses a flag-based synchronization mechanism:
-    - Main thread processes tracks and sets _tracks_ready flag to True
-    - Worker monitors the flag and sends tracks when True
-    - Worker resets flag to False after sending
+    Uses an event-based synchronization mechanism:
+    - Main thread processes tracks and sets the _tracks_ready event
+    - Worker blocks on the event and sends tracks when it is set
+    - Worker clears the event after sending
 
     UDP-like behavior: Always sends the latest tracks, dropping old ones if sending is in progress.
     """
@@ -788,9 +1046,9 @@ class TracksSenderWorker(threading.Thread):
         self._tracks_timestamp = 0
         self._sending = False
 
-        # Flag to track if tracks have been processed and ready to send
-        self._tracks_ready_lock = threading.Lock()
-        self._tracks_ready = False
+        # Set when tracks have been processed and are ready to send; the
+        # worker blocks on it instead of polling
+        self._tracks_ready = threading.Event()
 
         # Statistics for monitoring
         self.sent_count = 0
@@ -825,8 +1083,7 @@ class TracksSenderWorker(threading.Thread):
         This signals the worker that all tracks have been processed and are ready
         to be sent to the servers.
         """
-        with self._tracks_ready_lock:
-            self._tracks_ready = True
+        self._tracks_ready.set()
 
     def _get_current_tracks(self):
         """Get current tracks (thread-safe).
@@ -839,27 +1096,18 @@ class TracksSenderWorker(threading.Thread):
                 return (self._current_tracks.copy(), self._tracks_timestamp)
             return (None, 0)
 
-    def _is_tracks_ready(self):
-        """Check if tracks are ready to send (thread-safe).
-
-        Returns:
-            bool: True if tracks are ready to send
-        """
-        with self._tracks_ready_lock:
-            return self._tracks_ready
-
     def _reset_tracks_ready(self):
-        """Reset the tracks ready flag (thread-safe)."""
-        with self._tracks_ready_lock:
-            self._tracks_ready = False
+        """Reset the tracks ready event (thread-safe)."""
+        self._tracks_ready.clear()
         
     def run(self):
         """Main worker loop - wait for tracks to be processed, then send.
 
         Synchronization mechanism:
         - Main thread processes all tracks and calls mark_tracks_ready()
-        - This worker monitors the _tracks_ready flag
-        - When flag is True, worker sends all tracks and resets flag to False
+        - This worker blocks on the _tracks_ready event (waking at least every
+          0.5s to notice stop())
+        - When the event is set, worker sends all tracks and clears it
         - UDP-like behavior: If sending is in progress, skip and wait for next frame
 
         Always sends the latest tracks, dropping old ones.
@@ -868,19 +1116,16 @@ class TracksSenderWorker(threading.Thread):
 
         while self.running:
             try:
-                # Check if tracks are ready to send (flag set by main thread)
-                if not self._is_tracks_ready():
-                    # Tracks not ready yet, sleep briefly and check again
-                    time.sleep(0.001)  # 1ms
+                # Wait until tracks are ready to send (event set by main thread)
+                if not self._tracks_ready.wait(timeout=0.5):
                     continue
 
                 # Get current tracks
                 current_tracks, _ = self._get_current_tracks()
 
                 if current_tracks is None:
-                    # No tracks available yet, reset flag and sleep
+                    # No tracks available yet, wait for the next frame
                     self._reset_tracks_ready()
-                    time.sleep(0.001)  # 1ms
                     continue
 
                 # Check rate limiting: enforce 100ms min interval between sends
@@ -946,7 +1191,7 @@ class TracksSenderWorker(threading.Thread):
                 - keypoints: list of 34 floats (17 keypoints × 2 coordinates)
                 - bbox: list [x, y, w, h]
                 - pose_label: str
-                - safety_status: str (normal, unsafe, fall)
+                - safety_status or status: str (normal, unsafe, fall)
                 - safety_reason: str (e.g., "lying_on_floor", "unsafe_sleep_too_long", "normal")
         """
         try:
@@ -971,28 +1216,18 @@ class TracksSenderWorker(threading.Thread):
                                           track_for_streaming["int_features"])
                 tracks_for_streaming.append(track_for_streaming)
             
-            # Send to streaming server asynchronously (fire-and-forget)
+            # One POST per frame for all tracks, sent from this thread; newer
+            # frames that arrive meanwhile replace each other until it returns
             # Always send tracks, even if empty list, to ensure server knows current state
             self.profiler.start_task("streaming_send")
-            self._send_to_streaming_async(self.camera_id, tracks_for_streaming)
+            if not send_tracks_to_streaming_server(self.camera_id, tracks_for_streaming):
+                self.error_count += 1
             self.profiler.end_task("streaming_send")
                 
         except Exception as e:
             logger.print("TRACKS_SENDER", "Error sending tracks: %s", e)
             self.error_count += 1
     
-    def _send_to_streaming_async(self, camera_id, tracks):
-        """Send tracks to streaming server asynchronously using a thread."""
-        def _send():
-            try:
-                from streaming import send_tracks_to_streaming_server
-                send_tracks_to_streaming_server(camera_id, tracks)
-            except Exception as e:
-                logger.print("TRACKS_SENDER", "Error in async streaming send: %s", e)
-        
-        thread = threading.Thread(target=_send, daemon=True)
-        thread.start()
-    
     def stop(self):
         """Stop the worker."""
         self.running = False